@@ -0,0 +1,244 @@
+"""Benchmark the data pipeline and figure construction on synthetic data
+
+    python benchmarks/run.py --scales 1e4 1e5 1e6 --output results.json
+    python benchmarks/run.py --scales 1e5 --compare baseline.json
+
+Each scale is a number of rows per table. Tables are generated with the
+seeded generators of dashboard.synthetic (exact sample schemas and string
+formats). Every scenario is timed over --repeat runs (best and median
+seconds), then run once more under tracemalloc for its peak memory (Python
+and NumPy allocations; Arrow buffers are not traced, the process's maximum
+resident size is recorded at the end instead).
+Scales above --max-memory-rows only run the file-based streaming scenario,
+with files written chunk by chunk, so 10^8 rows need disk, not RAM.
+Results are written as JSON; --compare prints the ratio to an earlier run
+and exits with status 1 if any scenario regressed.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from dashboard.cubes import monitoring_cube
+from dashboard.figures import line_chart, trace_chart
+from dashboard.funnel import FactTable
+from dashboard.kpis import RunningKpis
+from dashboard.metrics import compute_metrics, table_metrics
+from dashboard.processing import PARSED_COLUMNS, process_data, process_table
+from dashboard.registry import SECTION_REQUIREMENTS, DatasetRegistry
+from dashboard.resampling import DEFAULT_MAX_POINTS, rollup, slice_time_range, sort_by_time
+from dashboard.schema import TABLE_NAMES, compact_table
+from dashboard.sources import FileDataSource, write_tables
+from dashboard.streaming import stream_rollup
+from dashboard.synthetic import generate_tables, write_synthetic
+
+
+def clean(tables):
+    """Parse the formatted columns of every table"""
+    for table, df in tables.items():
+        process_table(table, df, set(PARSED_COLUMNS[table]))
+    return tables
+
+
+def derive(tables):
+    """Compute every ratio metric of already cleaned tables"""
+    for table, df in tables.items():
+        compute_metrics(df, table, [m.name for m in table_metrics(table)])
+    return tables
+
+
+def copies(tables):
+    """Fresh copies, so in-place scenarios start from the same input every run"""
+    return {table: df.copy() for table, df in tables.items()}
+
+
+def join_facts(tables):
+    """Monthly fact table of social, website and events with its funnel rates"""
+    facts = FactTable()
+    for table in ('social', 'website', 'events'):
+        facts.update(table, tables[table])
+    return facts.frame()
+
+
+def in_memory_scenarios(rows, seed, workdir):
+    """(name, setup, run) for every scenario on tables held in memory
+
+    setup() builds the scenario's input outside the timed region; run(input)
+    is the timed part.
+    """
+    raw = generate_tables(rows, seed=seed, invalid_fraction=0.001)
+    cleaned = clean(copies(raw))
+    processed = derive(copies(cleaned))
+    compact = {table: compact_table(table, df)[0] for table, df in processed.items()}
+    for fmt in ('csv', 'parquet'):
+        write_tables(raw, os.path.join(workdir, fmt), fmt)
+    months = compact['social']['Month']
+    start, end = months.quantile(0.25), months.quantile(0.75)
+
+    return [
+        ('generate', lambda: None, lambda _: generate_tables(rows, seed=seed)),
+        ('load_csv', lambda: None, lambda _: FileDataSource(os.path.join(workdir, 'csv')).read_tables()),
+        ('load_parquet', lambda: None, lambda _: FileDataSource(os.path.join(workdir, 'parquet')).read_tables()),
+        ('clean', lambda: copies(raw), clean),
+        ('derive', lambda: copies(cleaned), derive),
+        ('process_data', lambda: copies(raw), lambda t: process_data(*(t[table] for table in TABLE_NAMES))),
+        ('compact', lambda: processed, lambda t: {table: compact_table(table, df) for table, df in t.items()}),
+        ('filter_time_range', lambda: compact['social'],
+         lambda df: df[(df['Month'] >= start) & (df['Month'] <= end)]),
+        ('filter_time_slice', lambda: sort_by_time(compact['social'], 'Month'),
+         lambda df: slice_time_range(df, 'Month', start.strftime('%Y-%m'), end.strftime('%Y-%m'))),
+        ('filter_cube_build', lambda: compact['monitoring'], monitoring_cube),
+        ('filter_cube_select', lambda: monitoring_cube(compact['monitoring']),
+         lambda cube: cube.select(cube.values[:2])),
+        ('aggregate_rollup', lambda: compact,
+         lambda t: (rollup(t['social'], 'social', 'Month', 'monthly'),
+                    rollup(t['monitoring'], 'monitoring', 'Month', 'monthly', by='Platform'))),
+        ('aggregate_facts', lambda: compact, join_facts),
+        ('aggregate_kpis', lambda: compact,
+         lambda t: [RunningKpis().update(table, t[table]) for table in ('social', 'website')]),
+        ('section_compute', lambda: None, lambda _: [
+            DatasetRegistry(FileDataSource(os.path.join(workdir, 'parquet'))).section(section)
+            for section in SECTION_REQUIREMENTS]),
+        ('figure_build', lambda: compact, lambda t: (
+            line_chart(t['social'], x='Month', y='Spend_Clean', title='Spend', table='social',
+                       max_points=DEFAULT_MAX_POINTS),
+            trace_chart(t['social'], x='Month', traces=[{'y': 'CPM'}, {'y': 'CPC'}], title='Cost', table='social',
+                        max_points=DEFAULT_MAX_POINTS),
+            line_chart(t['monitoring'], x='Month', y='Followers', color='Platform', title='Followers',
+                       table='monitoring', max_points=DEFAULT_MAX_POINTS),
+        )),
+        ('figure_serialize', lambda: line_chart(compact['social'], x='Month', y='Spend_Clean', title='Spend',
+                                                 table='social', max_points=DEFAULT_MAX_POINTS),
+         lambda fig: fig.to_json()),
+    ]
+
+
+def streaming_scenarios(rows, seed, workdir, chunk_rows):
+    """(name, setup, run) for the scenarios that never hold a whole table in memory"""
+    directory = os.path.join(workdir, 'stream')
+    write_synthetic(directory, rows, 'parquet', seed=seed, tables=['social', 'monitoring'], chunk_rows=chunk_rows)
+    source = FileDataSource(directory)
+    return [
+        ('stream_rollup', lambda: None, lambda _: (
+            stream_rollup(source, 'social', chunk_rows=chunk_rows),
+            stream_rollup(source, 'monitoring', chunk_rows=chunk_rows))),
+    ]
+
+
+def measure(setup, run, repeat, memory):
+    """Best and median seconds of run(setup()) over repeat runs, and its tracemalloc peak"""
+    times = []
+    for _ in range(repeat):
+        data = setup()
+        start = time.perf_counter()
+        run(data)
+        times.append(time.perf_counter() - start)
+    result = {'seconds_best': min(times), 'seconds_median': statistics.median(times), 'repeat': repeat}
+    if memory:
+        data = setup()
+        tracemalloc.start()
+        run(data)
+        result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def environment():
+    """Versions and machine description stored with the results"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print each scenario's best time relative to baseline; returns the regressed scenarios"""
+    previous = {(r['scenario'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    print(f"{'scenario':<22}{'rows':>12}{'before s':>12}{'after s':>12}{'ratio':>8}", file=sys.stderr)
+    for record in results['results']:
+        old = previous.get((record['scenario'], record['rows']))
+        if old is None:
+            continue
+        ratio = record['seconds_best'] / old['seconds_best'] if old['seconds_best'] else float('inf')
+        flag = '  REGRESSION' if ratio > threshold else ''
+        print(f"{record['scenario']:<22}{record['rows']:>12,}{old['seconds_best']:>12.4f}"
+              f"{record['seconds_best']:>12.4f}{ratio:>8.2f}{flag}", file=sys.stderr)
+        if flag:
+            regressions.append(record['scenario'])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard pipeline on synthetic data.")
+    parser.add_argument('--scales', nargs='+', type=float, default=[1e4, 1e5, 1e6],
+                        help="rows per table for each run (default: 1e4 1e5 1e6)")
+    parser.add_argument('--scenario', action='append', dest='scenarios',
+                        help="run only this scenario; repeat for several (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per scenario (default: 3)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak measurement")
+    parser.add_argument('--max-memory-rows', type=float, default=1e7,
+                        help="larger scales only run the streaming scenario (default: 1e7)")
+    parser.add_argument('--chunk-rows', type=int, default=1_000_000, help="chunk size for streaming scenarios")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--compare', help="earlier results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help="best-time ratio reported as a regression with --compare (default: 1.2)")
+    args = parser.parse_args(argv)
+
+    results = {'environment': environment(), 'seed': args.seed, 'results': []}
+    for scale in args.scales:
+        rows = int(scale)
+        with tempfile.TemporaryDirectory() as workdir:
+            scenarios = streaming_scenarios(rows, args.seed, workdir, args.chunk_rows)
+            if rows <= args.max_memory_rows:
+                scenarios = in_memory_scenarios(rows, args.seed, workdir) + scenarios
+            for name, setup, run in scenarios:
+                if args.scenarios and name not in args.scenarios:
+                    continue
+                record = {'scenario': name, 'rows': rows,
+                          **measure(setup, run, args.repeat, not args.no_memory)}
+                results['results'].append(record)
+                peak = f"{record['peak_bytes'] / 2 ** 20:>10.1f} MB" if 'peak_bytes' in record else ''
+                print(f"{name:<22}{rows:>12,}{record['seconds_best']:>12.4f} s{peak}", file=sys.stderr)
+
+    results['max_rss_bytes'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1 @@
+"""Data layer for the Dolby Marketing Analytics Dashboard"""
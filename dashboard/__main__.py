@@ -0,0 +1,66 @@
+"""Command line entry point: python -m dashboard --help"""
+import argparse
+import json
+import sys
+
+from dashboard.analytics import SECTION_NAMES, compute_sections_from_directory, to_json_dict, write_results
+from dashboard.processing import make_executor
+from dashboard.resampling import GRANULARITIES
+from dashboard.sources import get_data_source
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m dashboard',
+        description="Compute the Dolby marketing dashboard metrics without starting Streamlit.",
+    )
+    parser.add_argument('--data-dir', help="directory of table files (default: $DOLBY_DASHBOARD_DATA_DIR or the sample data)")
+    parser.add_argument('--section', action='append', choices=SECTION_NAMES, dest='sections',
+                        help="section to compute; repeat for several (default: all)")
+    parser.add_argument('--format', choices=['json', 'parquet'], default='json')
+    parser.add_argument('--output', help="output file (json) or directory (parquet); json defaults to stdout")
+    parser.add_argument('--stream', choices=['daily', 'weekly', 'monthly'],
+                        help="stream the exports in chunks, rolled up to this granularity (for exports larger than memory)")
+    parser.add_argument('--start', metavar='YYYY-MM', help="first month to read (inclusive; default: all history)")
+    parser.add_argument('--end', metavar='YYYY-MM', help="last month to read (inclusive; default: all history)")
+    parser.add_argument('--granularity', choices=list(GRANULARITIES),
+                        help="roll the time series up to this granularity (default: as exported)")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="process tables on this many parallel workers (default: serial; -1: one per CPU)")
+    parser.add_argument('--executor', choices=['process', 'thread'], default='process',
+                        help="worker pool kind used with --workers (default: process)")
+    parser.add_argument('--snapshot', metavar='DIR',
+                        help="export every view as a static HTML/JSON bundle into DIR instead of computing metrics; "
+                             "views whose inputs are unchanged since the last export are kept")
+    parser.add_argument('--force', action='store_true', help="with --snapshot, rebuild every view")
+    args = parser.parse_args(argv)
+
+    if args.snapshot:
+        # Plotly is only needed to export; metric runs never import it
+        from dashboard.export import export_snapshot
+        result = export_snapshot(args.snapshot, get_data_source(args.data_dir, args.stream), args.sections, args.force,
+                                 args.start, args.end, args.granularity)
+        print(f"{len(result['built'])} views built, {len(result['unchanged'])} unchanged, "
+              f"{len(result['removed'])} removed", file=sys.stderr)
+        return 0
+
+    if args.format == 'parquet' and not args.output:
+        parser.error("--output is required for parquet")
+
+    if args.workers:
+        with make_executor(args.executor, args.workers if args.workers > 0 else None) as executor:
+            results = compute_sections_from_directory(args.data_dir, args.sections, executor, args.stream,
+                                                      args.start, args.end, args.granularity)
+    else:
+        results = compute_sections_from_directory(args.data_dir, args.sections, stream=args.stream,
+                                                  start=args.start, end=args.end, granularity=args.granularity)
+    if args.output:
+        write_results(results, args.output, args.format)
+    else:
+        json.dump(to_json_dict(results), sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
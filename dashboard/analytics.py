@@ -0,0 +1,80 @@
+"""Headless computation of every dashboard section's metrics
+
+Nothing here imports Streamlit or Plotly, so section metrics can be computed
+in batch jobs, worker pools or the command line (python -m dashboard).
+"""
+import json
+import os
+
+from dashboard.registry import SECTION_CUBES, SECTION_REQUIREMENTS, DatasetRegistry
+from dashboard.sources import get_data_source
+
+SECTION_NAMES = tuple(SECTION_REQUIREMENTS)
+
+
+def section_tables(registry, section, granularity=None):
+    """Processed tables of a section; cube-backed sections include the cube's precomputed columns
+
+    The funnel section is its joined fact table.
+    """
+    if section == 'funnel':
+        return {'funnel': registry.facts(granularity=granularity)}
+    tables = registry.section(section, granularity=granularity)
+    if section in SECTION_CUBES:
+        table, _ = SECTION_CUBES[section]
+        tables[table] = registry.cube(section, granularity=granularity).frame
+    return tables
+
+
+def compute_sections(source=None, sections=None, executor=None, start=None, end=None, granularity=None):
+    """Compute the requested sections (all by default) from a data source
+
+    With an executor (see processing.make_executor) the tables are processed
+    concurrently. start and end ("2025-01", inclusive) limit what is read
+    from the source; granularity rolls time series up per period.
+    Returns {'kpis': {...}, 'sections': {section: {table: DataFrame}}}.
+    """
+    registry = DatasetRegistry(source or get_data_source(), executor=executor, start=start, end=end)
+    sections = list(sections or SECTION_NAMES)
+    unknown = [section for section in sections if section not in SECTION_REQUIREMENTS]
+    if unknown:
+        raise ValueError(f"Unknown sections {unknown}, expected some of {', '.join(SECTION_NAMES)}")
+    registry.prefetch(sections)
+    return {
+        'kpis': {name: value.item() if hasattr(value, 'item') else value
+                 for name, value in registry.kpis().items()},
+        'sections': {section: section_tables(registry, section, granularity) for section in sections},
+    }
+
+
+def compute_sections_from_directory(data_dir=None, sections=None, executor=None, stream=None,
+                                    start=None, end=None, granularity=None):
+    """compute_sections for a data directory; picklable entry point for process pools"""
+    return compute_sections(get_data_source(data_dir, stream), sections, executor, start, end, granularity)
+
+
+def to_json_dict(results):
+    """JSON-serializable form of compute_sections results (tables as records)"""
+    return {
+        'kpis': results['kpis'],
+        'sections': {
+            section: {table: json.loads(df.to_json(orient='records', date_format='iso', double_precision=15))
+                      for table, df in tables.items()}
+            for section, tables in results['sections'].items()
+        },
+    }
+
+
+def write_results(results, output, fmt='json'):
+    """Write results as one JSON file, or as <output>/<section>/<table>.parquet plus kpis.json"""
+    if fmt == 'json':
+        with open(output, 'w') as f:
+            json.dump(to_json_dict(results), f, indent=2)
+        return
+    os.makedirs(output, exist_ok=True)
+    with open(os.path.join(output, 'kpis.json'), 'w') as f:
+        json.dump(results['kpis'], f, indent=2)
+    for section, tables in results['sections'].items():
+        os.makedirs(os.path.join(output, section), exist_ok=True)
+        for table, df in tables.items():
+            df.to_parquet(os.path.join(output, section, table + '.parquet'), index=False)
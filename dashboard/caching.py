@@ -0,0 +1,69 @@
+"""Caching helpers for the dashboard data layer"""
+import hashlib
+import threading
+import weakref
+
+import pandas as pd
+
+# Bump whenever process_data() changes the columns it derives, so that
+# processed datasets cached by an older build are never served
+PROCESSING_VERSION = 2
+
+# Fingerprints of frames whose content their producer already identifies by
+# a cache key: id(frame) -> (weak reference to the frame, fingerprint)
+_known = {}
+_known_lock = threading.Lock()
+
+
+def frame_fingerprint(df):
+    """Content hash of a DataFrame (columns, dtypes, index and values)
+
+    Frames registered with remember_fingerprint return their recorded
+    fingerprint without being hashed.
+    """
+    entry = _known.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    return content_fingerprint(df)
+
+
+def content_fingerprint(df, index=True):
+    """Hash of a DataFrame's columns, dtypes, values and (with index) index, always computed from its data"""
+    digest = hashlib.sha1()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=index).values.tobytes())
+    return digest.hexdigest()
+
+
+def key_fingerprint(*parts):
+    """Fingerprint of a cache key (strings, numbers and tuples of them) that already identifies some content"""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def remember_fingerprint(df, fingerprint):
+    """Record df's fingerprint so frame_fingerprint(df) returns it without hashing; returns df
+
+    For frames handed out by a cache whose key identifies their content
+    (see registry); df must not be modified afterwards.
+    """
+    frame_id = id(df)
+    with _known_lock:
+        _known[frame_id] = (weakref.ref(df), fingerprint)
+    weakref.finalize(df, _forget, frame_id)
+    return df
+
+
+def _forget(frame_id):
+    """Drop the fingerprint of a frame that no longer exists"""
+    with _known_lock:
+        entry = _known.get(frame_id)
+        if entry is not None and entry[0]() is None:
+            del _known[frame_id]
+
+
+def combine_fingerprints(*fingerprints):
+    """Fingerprint of data made of parts with the given fingerprints, in order"""
+    digest = hashlib.sha1()
+    for fingerprint in fingerprints:
+        digest.update(fingerprint.encode())
+    return digest.hexdigest()
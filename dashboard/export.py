@@ -0,0 +1,256 @@
+"""Static snapshot export of every dashboard view
+
+Every section is rendered for every discrete selector combination (social
+metric type, monitoring platform subsets, brand pulse metric) into a
+self-contained bundle that any static file server can host:
+
+    <output>/index.html           links to every view
+    <output>/plotly.min.js        Plotly, shared by every page
+    <output>/views/<view>.html    one page per view
+    <output>/views/<view>.json    the view's figures (and KPIs) as Plotly JSON
+    <output>/manifest.json        view -> fingerprint of its inputs
+
+Exporting again into the same directory rebuilds only the views whose
+inputs changed: a view's fingerprint covers its chart specs, the content
+hash of each chart's data and its KPIs.
+"""
+import hashlib
+import html
+import itertools
+import json
+import os
+import re
+
+import plotly
+from plotly.offline import get_plotlyjs
+
+from dashboard.caching import PROCESSING_VERSION, content_fingerprint
+from dashboard.figures import spec_key
+from dashboard.registry import SECTION_REQUIREMENTS, DatasetRegistry
+from dashboard.resampling import DEFAULT_MAX_POINTS
+from dashboard.sources import get_data_source
+from dashboard.views import (SECTION_HEADERS, SECTION_LABELS, SOCIAL_METRIC_TYPES, brandpulse_view, events_view,
+                             funnel_view, kpi_cards, monitoring_view, overview_view, social_view, website_view)
+
+# Bump when the page layout changes, so every view is rebuilt
+EXPORT_VERSION = 1
+
+# Platform subsets are exported up to this many platforms; beyond it (2^n
+# pages) only each single platform and all platforms together are exported
+MAX_SUBSET_VALUES = 6
+
+PAGE_STYLE = """
+body { font-family: sans-serif; margin: 0 2rem 2rem 2rem; color: #2c3e50; }
+.main-header { font-size: 2.5rem; font-weight: bold; color: #1f77b4; text-align: center; margin: 1rem 0 2rem 0; }
+.section-header { font-size: 1.5rem; font-weight: bold; margin: 2rem 0 1rem 0;
+                  border-bottom: 2px solid #1f77b4; padding-bottom: 0.5rem; }
+nav a, .selectors a { margin-right: 1rem; }
+.selectors a.current, nav a.current { font-weight: bold; }
+.row { display: flex; gap: 1rem; }
+.row > div { flex: 1; min-width: 0; }
+.kpis { display: flex; gap: 1rem; }
+.kpi { flex: 1; background: #f0f2f6; padding: 1rem; border-radius: 0.5rem; border-left: 4px solid #1f77b4; }
+.kpi .label { font-size: 0.9rem; } .kpi .value { font-size: 1.8rem; }
+"""
+
+
+def view_selections(registry, sections=None):
+    """(section, selection) for every view to export; selection maps selector -> value"""
+    for section in sections or SECTION_REQUIREMENTS:
+        if section == 'social':
+            for metric_type in SOCIAL_METRIC_TYPES:
+                yield section, {'metric_type': metric_type}
+        elif section == 'monitoring':
+            platforms = list(registry.cube('monitoring').values)
+            if len(platforms) <= MAX_SUBSET_VALUES:
+                sizes = range(len(platforms), 0, -1)
+                subsets = [list(c) for size in sizes for c in itertools.combinations(platforms, size)]
+            else:
+                subsets = [platforms] + [[platform] for platform in platforms]
+            for subset in subsets:
+                yield section, {'platforms': subset}
+        elif section == 'brandpulse':
+            for metric in registry.cube('brandpulse').values:
+                yield section, {'metric': metric}
+        else:
+            yield section, {}
+
+
+def build_view(registry, section, selection, granularity=None):
+    """Chart rows (see dashboard.views) and KPIs (overview only) of one view"""
+    if section == 'overview':
+        tables = registry.section(section, granularity=granularity)
+        return overview_view(tables['social'], tables['website']), registry.kpis()
+    if section == 'social':
+        return social_view(registry.section(section, granularity=granularity)['social'], selection['metric_type']), None
+    if section == 'website':
+        return website_view(registry.section(section, granularity=granularity)['website']), None
+    if section == 'events':
+        return events_view(registry.section(section, granularity=granularity)['events']), None
+    if section == 'funnel':
+        return funnel_view(registry.facts(granularity=granularity)), None
+    cube = registry.cube(section, granularity=granularity)
+    if section == 'monitoring':
+        return monitoring_view(cube.select(selection['platforms'])), None
+    return brandpulse_view(cube.select([selection['metric']]), selection['metric']), None
+
+
+def _selected_values(selection):
+    """Every selected value of a selection, flattening multi-selects"""
+    return [value for selected in selection.values()
+            for value in (selected if isinstance(selected, list) else [selected])]
+
+
+def view_id(section, selection):
+    """File-name-safe identifier of a view, e.g. 'monitoring--instagram-tiktok'"""
+    values = _selected_values(selection)
+    parts = [section] + [re.sub(r'[^a-z0-9]+', '-', str(value).lower()).strip('-') for value in values]
+    return parts[0] + ('--' + '-'.join(parts[1:]) if values else '')
+
+
+def chart_params(chart):
+    """Builder parameters of a chart; time-series charts (given a table) get the point budget, as in the app"""
+    if 'table' in chart.params:
+        return {'max_points': DEFAULT_MAX_POINTS, **chart.params}
+    return chart.params
+
+
+def view_fingerprint(rows, kpis):
+    """Hash of everything a view is rendered from"""
+    digest = hashlib.sha1(f"{PROCESSING_VERSION}:{EXPORT_VERSION}:{plotly.__version__}".encode())
+    for row in rows:
+        digest.update(b'|row')
+        for chart in row:
+            digest.update(repr(spec_key(chart.builder, chart_params(chart))).encode())
+            # Hashed from the rows themselves (not the registry's key
+            # fingerprint), so a view is rebuilt only when its own data changed
+            digest.update(content_fingerprint(chart.data, index=False).encode())
+    if kpis is not None:
+        digest.update(json.dumps({name: str(value) for name, value in kpis.items()}, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _page(title, body, root='..'):
+    """A complete HTML page loading the bundle's shared plotly.min.js from root"""
+    return (f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+            f'<script src="{root}/plotly.min.js"></script><style>{PAGE_STYLE}</style></head>'
+            f'<body><h1 class="main-header">🎵 Dolby Marketing Analytics Dashboard</h1>{body}</body></html>\n')
+
+
+def _links(entries, current):
+    """Anchor tags for (view id, label) pairs, marking the current view"""
+    return ''.join(f'<a href="{vid}.html"{" class=current" if vid == current else ""}>{html.escape(label)}</a>'
+                   for vid, label in entries)
+
+
+def render_page(vid, section, rows, figures, kpis, manifest):
+    """HTML page of one view, with section navigation and links to its sibling selections"""
+    defaults = {}
+    siblings = []
+    for other_id, entry in manifest.items():
+        defaults.setdefault(entry['section'], other_id)
+        if entry['section'] == section and entry['selection']:
+            siblings.append((other_id, entry['label']))
+    nav = _links([(defaults[s], SECTION_LABELS[s]) for s in SECTION_LABELS if s in defaults], defaults[section])
+    body = [f'<nav>{nav}</nav>',
+            f'<div class="section-header">{html.escape(SECTION_HEADERS[section])}</div>']
+    if siblings:
+        body.append(f'<div class="selectors">{_links(siblings, vid)}</div>')
+    if kpis is not None:
+        body.append('<div class="kpis">' + ''.join(
+            f'<div class="kpi"><div class="label">{html.escape(label)}</div>'
+            f'<div class="value">{html.escape(value)}</div></div>'
+            for label, value in kpi_cards(kpis)) + '</div>')
+    figures = iter(figures)
+    for row in rows:
+        body.append('<div class="row">' + ''.join(
+            '<div>' + next(figures).to_html(full_html=False, include_plotlyjs=False) + '</div>'
+            for _ in row) + '</div>')
+    return _page(f"{SECTION_LABELS[section]} {manifest[vid]['label']}".strip(), '\n'.join(body))
+
+
+def selection_label(selection):
+    """Human readable selection, e.g. 'Instagram + TikTok'"""
+    return ' + '.join(str(value) for value in _selected_values(selection))
+
+
+def export_snapshot(output, source=None, sections=None, force=False, start=None, end=None, granularity=None):
+    """Export every view of sections (all by default) into output; returns {'built', 'unchanged', 'removed'}
+
+    Views whose fingerprint matches output/manifest.json from an earlier
+    export are left as they are unless force is set. Views of the exported
+    sections that no longer exist (e.g. a platform dropped from the data)
+    are removed; views of other sections are kept in the bundle. start, end
+    and granularity export a time window, as for compute_sections.
+    """
+    registry = DatasetRegistry(source or get_data_source(), start=start, end=end)
+    views_dir = os.path.join(output, 'views')
+    os.makedirs(views_dir, exist_ok=True)
+    manifest_path = os.path.join(output, 'manifest.json')
+    previous = {'views': {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+
+    exported = set(sections or SECTION_REQUIREMENTS)
+    views = {vid: entry for vid, entry in previous['views'].items() if entry['section'] not in exported}
+    pending = []
+    for section, selection in view_selections(registry, sections):
+        rows, kpis = build_view(registry, section, selection, granularity)
+        vid = view_id(section, selection)
+        views[vid] = {'section': section, 'selection': selection, 'label': selection_label(selection),
+                      'fingerprint': view_fingerprint(rows, kpis)}
+        pending.append((vid, section, selection, rows, kpis))
+
+    # Navigation links depend on the set of views, so a change to that set
+    # rebuilds every page
+    same_views = {vid: entry['label'] for vid, entry in previous['views'].items()} == \
+                 {vid: entry['label'] for vid, entry in views.items()}
+    result = {'built': [], 'unchanged': [], 'removed': []}
+    for vid, section, selection, rows, kpis in pending:
+        paths = [os.path.join(views_dir, vid + ext) for ext in ('.html', '.json')]
+        if (not force and same_views and previous['views'].get(vid, {}).get('fingerprint') == views[vid]['fingerprint']
+                and all(os.path.exists(path) for path in paths)):
+            result['unchanged'].append(vid)
+            continue
+        figures = [chart.builder(chart.data, **chart_params(chart)) for row in rows for chart in row]
+        with open(paths[0], 'w', encoding='utf-8') as f:
+            f.write(render_page(vid, section, rows, figures, kpis, views))
+        with open(paths[1], 'w', encoding='utf-8') as f:
+            json.dump({
+                'section': section,
+                'selection': selection,
+                'kpis': {name: value.item() if hasattr(value, 'item') else value
+                         for name, value in kpis.items()} if kpis is not None else None,
+                'figures': [json.loads(fig.to_json()) for fig in figures],
+            }, f)
+        result['built'].append(vid)
+
+    for vid, entry in previous['views'].items():
+        if entry['section'] in exported and vid not in views:
+            for ext in ('.html', '.json'):
+                path = os.path.join(views_dir, vid + ext)
+                if os.path.exists(path):
+                    os.remove(path)
+            result['removed'].append(vid)
+
+    plotly_path = os.path.join(output, 'plotly.min.js')
+    if force or not os.path.exists(plotly_path) or previous.get('plotly') != plotly.__version__:
+        with open(plotly_path, 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+    with open(os.path.join(output, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(render_index(views))
+    with open(manifest_path, 'w') as f:
+        json.dump({'plotly': plotly.__version__, 'views': views}, f, indent=2)
+    return result
+
+
+def render_index(views):
+    """Index page linking every exported view, grouped by section"""
+    body = []
+    for section, label in SECTION_LABELS.items():
+        entries = [(vid, entry['label'] or label) for vid, entry in views.items() if entry['section'] == section]
+        if entries:
+            body.append(f'<div class="section-header">{html.escape(label)}</div><ul>' + ''.join(
+                f'<li><a href="views/{vid}.html">{html.escape(text)}</a></li>' for vid, text in entries) + '</ul>')
+    return _page("Dolby Marketing Analytics Dashboard", '\n'.join(body), root='.')
@@ -0,0 +1,200 @@
+"""Chart builders and a figure cache keyed on chart spec and data fingerprint
+
+Every dashboard chart is built by one of the builder functions below from a
+DataFrame plus plain keyword parameters (the chart spec). FigureCache
+memoizes the built figures on (builder, spec, content hash of the frame), so
+a rerun with the same data and selection skips figure construction.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from dashboard.caching import frame_fingerprint
+from dashboard.instrumentation import count, timed
+from dashboard.resampling import auto_rollup, downsample
+
+# Default memory cap for cached figures, measured as estimated by figure_size
+DEFAULT_FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+# Bytes counted per figure besides its trace data (layout, trace properties)
+FIGURE_OVERHEAD_BYTES = 4096
+
+# Trace properties holding per-point data, the bulk of a figure's size
+DATA_PROPERTIES = ('x', 'y', 'z', 'text', 'customdata', 'values', 'labels')
+
+# Traces with more points than this are drawn with WebGL (go.Scattergl),
+# the same cut-off Plotly Express uses for render_mode='auto'
+WEBGL_MIN_POINTS = 1000
+
+
+def resample_frame(df, x, table=None, max_points=None, by=None):
+    """Roll a time-series frame up to fit max_points periods (table enables rollup)"""
+    if table is not None and max_points is not None:
+        df = auto_rollup(df, table, x, max_points, by=by)
+    return df
+
+
+def scatter_trace(x, y, **properties):
+    """go.Scatter trace, or go.Scattergl for large series"""
+    trace_type = go.Scattergl if len(y) > WEBGL_MIN_POINTS else go.Scatter
+    return trace_type(x=x, y=y, mode='lines+markers', **properties)
+
+
+def line_chart(df, x, y, title, labels=None, color=None, line_width=None, table=None, max_points=None):
+    """Plotly Express line chart
+
+    With table and max_points set, the frame is rolled up and each line is
+    LTTB-downsampled to at most max_points points. Plotly Express switches
+    to WebGL rendering on its own for large frames.
+    """
+    df = resample_frame(df, x, table, max_points, by=color)
+    if max_points is not None:
+        df = downsample(df, y, max_points, by=color)
+    fig = px.line(df, x=x, y=y, color=color, title=title, labels=labels)
+    if line_width is not None:
+        fig.update_traces(line=dict(width=line_width))
+    return fig
+
+
+def bar_chart(df, x, y, title, labels=None, color=None):
+    """Plotly Express bar chart"""
+    return px.bar(df, x=x, y=y, color=color, title=title, labels=labels)
+
+
+def trace_chart(df, x, traces, title, xaxis_title=None, yaxis_title=None, kind='scatter',
+                table=None, max_points=None):
+    """One go.Scatter (lines+markers) or go.Bar trace per entry of traces
+
+    Each trace is a dict with the column 'y' plus extra trace properties
+    such as 'name', 'line' or 'offsetgroup'. Scatter traces are resampled
+    like line_chart and drawn with WebGL when large.
+    """
+    df = resample_frame(df, x, table, max_points)
+    fig = go.Figure()
+    for trace in traces:
+        trace = dict(trace)
+        column = trace.pop('y')
+        if kind == 'bar':
+            fig.add_trace(go.Bar(x=df[x], y=df[column], **trace))
+        else:
+            rows = downsample(df, column, max_points) if max_points is not None else df
+            fig.add_trace(scatter_trace(rows[x], rows[column], **trace))
+    fig.update_layout(title=title, xaxis_title=xaxis_title, yaxis_title=yaxis_title)
+    return fig
+
+
+def dual_axis_chart(df, x, primary, secondary, title, table=None, max_points=None):
+    """Two lines+markers traces on primary and secondary y axes
+
+    primary and secondary are dicts with 'y', 'name', 'axis_title' and an
+    optional 'divisor' applied to the values (e.g. 1000000 for millions).
+    Traces are resampled like line_chart.
+    """
+    df = resample_frame(df, x, table, max_points)
+    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    for trace, secondary_y in ((primary, False), (secondary, True)):
+        rows = downsample(df, trace['y'], max_points) if max_points is not None else df
+        y = rows[trace['y']]
+        if trace.get('divisor'):
+            y = y / trace['divisor']
+        fig.add_trace(scatter_trace(rows[x], y, name=trace['name']), secondary_y=secondary_y)
+    fig.update_layout(title=title)
+    fig.update_yaxes(title_text=primary['axis_title'], secondary_y=False)
+    fig.update_yaxes(title_text=secondary['axis_title'], secondary_y=True)
+    return fig
+
+
+def funnel_chart(df, stages, title):
+    """go.Funnel of each stage column's total over the rows of df
+
+    stages is a list of (label, column) pairs, widest stage first; each bar
+    is annotated with its share of the previous stage.
+    """
+    fig = go.Figure(go.Funnel(y=[label for label, _ in stages], x=[df[column].sum() for _, column in stages],
+                              textinfo='value+percent previous'))
+    fig.update_layout(title=title)
+    return fig
+
+
+def figure_size(fig):
+    """Estimated bytes held by a figure: its traces' per-point data plus a fixed overhead
+
+    Cheap next to serializing the figure, which st.plotly_chart does anyway.
+    """
+    size = FIGURE_OVERHEAD_BYTES
+    for trace in fig.data:
+        for name in DATA_PROPERTIES:
+            values = trace[name] if name in trace else None
+            if values is not None and not isinstance(values, str):
+                size += np.asarray(values).nbytes
+    return size
+
+
+def spec_key(builder, params):
+    """Hashable, order-independent key for a builder and its parameters"""
+    return (builder.__module__, builder.__qualname__, repr(sorted(params.items())))
+
+
+class FigureCache:
+    """Thread-safe LRU cache of built figures with a memory cap
+
+    Entry size is estimated from the figure's trace data (figure_size) when
+    the figure is built. Least recently used entries are evicted until
+    the total fits in max_bytes. Entries remember the table their frame came
+    from (df.attrs['table'], set by the registry) so they can be dropped per
+    table when it changes.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key -> (figure, size in bytes, source table)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, builder, df, **params):
+        """Cached figure for builder(df, **params), building it on a miss"""
+        key = spec_key(builder, params) + (frame_fingerprint(df),)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                count('figure_cache_hits')
+                return entry[0]
+            self.misses += 1
+        count('figure_cache_misses')
+
+        with timed('figure_build', builder=builder.__name__, title=params.get('title')):
+            fig = builder(df, **params)
+            size = figure_size(fig)
+        with self._lock:
+            if key not in self._entries and size <= self.max_bytes:
+                self._entries[key] = (fig, size, df.attrs.get('table'))
+                self._size += size
+                while self._size > self.max_bytes:
+                    _, (_, evicted, _) = self._entries.popitem(last=False)
+                    self._size -= evicted
+        return fig
+
+    def invalidate(self, builder=None, table=None):
+        """Drop every entry, or only those built by builder and/or from table"""
+        with self._lock:
+            for key, (_, size, source_table) in list(self._entries.items()):
+                if builder is not None and key[:2] != spec_key(builder, {})[:2]:
+                    continue
+                if table is not None and source_table != table:
+                    continue
+                del self._entries[key]
+                self._size -= size
+
+    def stats(self):
+        """Entry count, total size in bytes and hit/miss counters"""
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size,
+                    'hits': self.hits, 'misses': self.misses}
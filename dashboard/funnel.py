@@ -0,0 +1,76 @@
+"""Month-indexed fact table joining social, website and events
+
+The three tables share Month. Each is summed per month and the sums are
+outer-joined into one fact table, one row per month, from which the
+impressions -> clicks -> visits -> demos -> signups funnel and the blended
+cross-table ratios (METRICS['funnel']) are computed in one batched pass. A
+month missing from a table keeps NaN sums for that table's columns, so the
+rates using them are NaN rather than 0; blended totals add up the tables
+present that month. FactTable keeps
+the monthly sums and folds appended batches into them, so new data only
+touches its own months and the history is never re-joined.
+"""
+import pandas as pd
+
+from dashboard.caching import frame_fingerprint, remember_fingerprint
+from dashboard.metrics import DEMOS, LEADS, compute_metrics
+
+# Columns summed per month into the fact table, per source table
+FACT_COLUMNS = {
+    'social': ['Spend_Clean', 'Impressions', 'Clicks to dolby.com landing', 'Attributed sweeps signups on dolby.com'],
+    'website': ['Website visits', 'Uniques', 'Demos completed', 'Total sweeps signups'],
+    'events': ['Event_Spend_Clean', DEMOS, LEADS],
+}
+
+# Blended totals across tables: column -> the fact columns it adds up
+TOTAL_COLUMNS = {
+    'Total_Spend': ['Spend_Clean', 'Event_Spend_Clean'],
+    'Total_Demos': ['Demos completed', DEMOS],
+}
+
+# Funnel stages in order: (label, fact column)
+FUNNEL_STAGES = [
+    ('Impressions', 'Impressions'),
+    ('Clicks', 'Clicks to dolby.com landing'),
+    ('Visits', 'Website visits'),
+    ('Demos', 'Demos completed'),
+    ('Signups', 'Total sweeps signups'),
+]
+
+
+def fact_columns():
+    """Columns the fact table reads, per table (Month included)"""
+    return {table: ['Month'] + columns for table, columns in FACT_COLUMNS.items()}
+
+
+class FactTable:
+    """Monthly sums of FACT_COLUMNS, updated batch by batch"""
+
+    def __init__(self):
+        columns = [col for columns in FACT_COLUMNS.values() for col in columns]
+        self._sums = pd.DataFrame(columns=columns, index=pd.DatetimeIndex([], name='Month'), dtype='float64')
+        self._frame = None  # fact table of the current sums, built on first use
+        self.version = 0    # incremented by every update
+
+    def update(self, table, df):
+        """Fold the rows of one processed table (a full frame or an appended batch) into the monthly sums"""
+        columns = FACT_COLUMNS[table]
+        sums = df.groupby('Month', sort=True, observed=True)[columns].sum().astype('float64')
+        months = self._sums.index.union(sums.index)
+        if not months.equals(self._sums.index):
+            self._sums = self._sums.reindex(months)
+        self._sums.loc[sums.index, columns] = self._sums.loc[sums.index, columns].fillna(0) + sums
+        self._frame = None
+        self.version += 1
+
+    def frame(self):
+        """The fact table: Month, the monthly sums, blended totals and funnel rates, sorted by Month"""
+        if self._frame is None:
+            facts = self._sums.copy()
+            for total, parts in TOTAL_COLUMNS.items():
+                facts[total] = facts[parts].sum(axis=1, min_count=1)
+            facts = facts.reset_index()
+            compute_metrics(facts, 'funnel')
+            facts.attrs['table'] = 'funnel'
+            self._frame = remember_fingerprint(facts, frame_fingerprint(facts))
+        return self._frame
@@ -0,0 +1,155 @@
+"""Per-rerun performance instrumentation
+
+A RunProfile collects stage timings, counters and memory sizes for one
+dashboard rerun (or one batch job). The entry point activates it with
+profiling(); code anywhere below records into it through timed(), count()
+and record_memory(), which do nothing when no profile is active. Shared
+objects (registries, the figure cache) record into the profile of the rerun
+that calls them. A finished profile is a plain dict (to_record) for the
+debug panel, or one JSON line for structured logs (write_log).
+"""
+import contextvars
+import json
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+
+logger = logging.getLogger('dashboard.perf')
+
+_active = contextvars.ContextVar('dashboard_profile', default=None)
+
+
+class RunProfile:
+    """Stage timings, counters and memory sizes of one run"""
+
+    def __init__(self, name='rerun', **labels):
+        self.name = name
+        self.labels = labels
+        self.run_id = uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.seconds = None
+        self.stages = []    # {'stage': name, 'seconds': float, **labels} in completion order
+        self.counters = {}  # name -> count
+        self.memory = {}    # name -> bytes
+        self.error = None   # {'type', 'message'} if the run failed
+        self._start = time.perf_counter()
+
+    def add_stage(self, stage, seconds, **labels):
+        """Record one timed stage"""
+        self.stages.append({'stage': stage, 'seconds': seconds, **labels})
+
+    def count(self, name, n=1):
+        """Increment a counter"""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_memory(self, name, nbytes):
+        """Record a memory size in bytes"""
+        self.memory[name] = int(nbytes)
+
+    def record_error(self, error):
+        """Record the exception that ended the run"""
+        self.error = {'type': type(error).__name__, 'message': str(error)}
+
+    def finish(self):
+        """Stop the run's wall-clock timer"""
+        if self.seconds is None:
+            self.seconds = time.perf_counter() - self._start
+
+    def totals(self):
+        """Calls and total seconds per stage name"""
+        totals = {}
+        for record in self.stages:
+            total = totals.setdefault(record['stage'], {'calls': 0, 'seconds': 0.0})
+            total['calls'] += 1
+            total['seconds'] += record['seconds']
+        return totals
+
+    def to_record(self):
+        """JSON-serializable summary of the run"""
+        return {
+            'run_id': self.run_id,
+            'name': self.name,
+            'started_at': self.started_at,
+            'seconds': self.seconds,
+            **self.labels,
+            'stages': self.stages,
+            'totals': self.totals(),
+            'counters': dict(self.counters),
+            'memory': dict(self.memory),
+            'error': self.error,
+        }
+
+
+@contextmanager
+def profiling(profile):
+    """Make profile the active profile for the enclosed code; finishes it on exit"""
+    token = _active.set(profile)
+    try:
+        yield profile
+    finally:
+        _active.reset(token)
+        profile.finish()
+
+
+def active_profile():
+    """The active RunProfile, or None"""
+    return _active.get()
+
+
+@contextmanager
+def timed(stage, **labels):
+    """Time the enclosed block as a stage of the active profile
+
+    A block that raises is recorded with an 'error' label naming the
+    exception type.
+    """
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        labels['error'] = type(e).__name__
+        raise
+    finally:
+        profile.add_stage(stage, time.perf_counter() - start, **labels)
+
+
+def record_stage(stage, seconds, **labels):
+    """Record an already measured stage in the active profile"""
+    profile = _active.get()
+    if profile is not None:
+        profile.add_stage(stage, seconds, **labels)
+
+
+def count(name, n=1):
+    """Increment a counter of the active profile"""
+    profile = _active.get()
+    if profile is not None:
+        profile.count(name, n)
+
+
+def record_memory(name, nbytes):
+    """Record a memory size in the active profile"""
+    profile = _active.get()
+    if profile is not None:
+        profile.record_memory(name, nbytes)
+
+
+def record_error(error):
+    """Record the exception that ended the active profile's run"""
+    profile = _active.get()
+    if profile is not None:
+        profile.record_error(error)
+
+
+def write_log(profile, path=None):
+    """Emit the profile as one JSON line on the dashboard.perf logger, and append it to path if given"""
+    line = json.dumps(profile.to_record(), default=str)
+    logger.info(line)
+    if path:
+        with open(path, 'a') as f:
+            f.write(line + '\n')
@@ -0,0 +1,52 @@
+"""Overview KPI definitions and running aggregates"""
+import numpy as np
+
+# KPI name -> (table, column, aggregation); 'mean' is the mean of the row values
+KPIS = {
+    'total_spend': ('social', 'Spend_Clean', 'sum'),
+    'total_signups': ('social', 'Attributed sweeps signups on dolby.com', 'sum'),
+    'average_ctr': ('social', 'CTR', 'mean'),
+    'total_website_visits': ('website', 'Website visits', 'sum'),
+}
+
+
+def kpi_columns():
+    """Columns the KPIs read, per table"""
+    columns = {}
+    for table, column, _ in KPIS.values():
+        columns.setdefault(table, [])
+        if column not in columns[table]:
+            columns[table].append(column)
+    return columns
+
+
+def _total(values):
+    """Sum in full precision (float32/int8 storage must not limit the accumulator)"""
+    values = values.to_numpy()
+    return values.sum(dtype=np.float64 if values.dtype.kind == 'f' else np.int64)
+
+
+class RunningKpis:
+    """Sums and counts behind each KPI, updated batch by batch"""
+
+    def __init__(self):
+        self._sums = {name: 0 for name in KPIS}
+        self._counts = {name: 0 for name in KPIS}
+
+    def update(self, table, df):
+        """Fold the rows of one table (a full frame or an appended batch) into the KPIs"""
+        for name, (kpi_table, column, _) in KPIS.items():
+            if kpi_table == table:
+                values = df[column].dropna()
+                self._sums[name] += _total(values)
+                self._counts[name] += len(values)
+
+    def values(self):
+        """Current value of every KPI"""
+        result = {}
+        for name, (_, _, aggregation) in KPIS.items():
+            if aggregation == 'sum':
+                result[name] = self._sums[name]
+            else:
+                result[name] = self._sums[name] / self._counts[name] if self._counts[name] else 0.0
+        return result
@@ -0,0 +1,108 @@
+"""Declarative ratio metrics (CTR, CPM, CPC, CPSignup, CPL, ...) and their engine
+
+A metric is numerator / denominator * scale. All metrics requested for a
+table are computed in one batched NumPy pass: the input columns are stacked
+into a single float64 block and divided column-wise, so the cost per rerun
+is one (rows x metrics) division regardless of how many KPIs are defined.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+# What a metric evaluates to when its denominator is not positive
+ZERO_POLICIES = ('zero', 'nan')
+
+
+@dataclass(frozen=True)
+class Metric:
+    """numerator / denominator * scale, with zero_policy for non-positive denominators"""
+    name: str
+    numerator: str
+    denominator: str
+    scale: float = 1.0
+    zero_policy: str = 'zero'
+
+    def __post_init__(self):
+        if self.zero_policy not in ZERO_POLICIES:
+            raise ValueError(f"Metric '{self.name}': zero_policy must be one of {ZERO_POLICIES}")
+
+
+DEMOS = '# demos of Dolby Play conducted for mobile device partner contacts'
+LEADS = '# new mobile device partner leads generated'
+
+METRICS = {
+    'social': [
+        Metric('CTR', 'Clicks to dolby.com landing', 'Impressions', 100),
+        Metric('Click_to_Signup_Rate', 'Attributed sweeps signups on dolby.com', 'Clicks to dolby.com landing', 100),
+        Metric('CPM', 'Spend_Clean', 'Impressions', 1000),
+        Metric('CPC', 'Spend_Clean', 'Clicks to dolby.com landing'),
+        Metric('CPSignup', 'Spend_Clean', 'Attributed sweeps signups on dolby.com'),
+    ],
+    'website': [
+        Metric('Unique_to_Demo_Rate', 'Demos completed', 'Uniques', 100),
+        Metric('Demo_to_Signup_Rate', 'Total sweeps signups', 'Demos completed', 100),
+    ],
+    'events': [
+        Metric('CPDemo', 'Event_Spend_Clean', DEMOS),
+        Metric('CPL', 'Event_Spend_Clean', LEADS),
+        Metric('Demo_to_Lead_Rate', LEADS, DEMOS, 100),
+    ],
+    'monitoring': [],
+    'brandpulse': [],
+    # Computed on the joined monthly fact table (see dashboard.funnel);
+    # months missing a stage get NaN rather than a 0% rate
+    'funnel': [
+        Metric('Impression_to_Click_Rate', 'Clicks to dolby.com landing', 'Impressions', 100, 'nan'),
+        Metric('Click_to_Visit_Rate', 'Website visits', 'Clicks to dolby.com landing', 100, 'nan'),
+        Metric('Visit_to_Demo_Rate', 'Demos completed', 'Website visits', 100, 'nan'),
+        Metric('Demo_to_Signup_Rate', 'Total sweeps signups', 'Demos completed', 100, 'nan'),
+        Metric('Impression_to_Signup_Rate', 'Total sweeps signups', 'Impressions', 100, 'nan'),
+        Metric('Social_Click_Share_of_Visits', 'Clicks to dolby.com landing', 'Website visits', 100, 'nan'),
+        Metric('Blended_CPDemo', 'Total_Spend', 'Total_Demos', 1, 'nan'),
+        Metric('Blended_CPSignup', 'Total_Spend', 'Total sweeps signups', 1, 'nan'),
+    ],
+}
+
+
+def register_metric(table, metric):
+    """Add a metric definition to table, replacing any metric of the same name"""
+    METRICS[table] = [m for m in METRICS[table] if m.name != metric.name] + [metric]
+
+
+def table_metrics(table, names=None):
+    """Metric definitions of table, restricted to names (None for all)"""
+    metrics = METRICS[table]
+    if names is None:
+        return list(metrics)
+    known = {m.name for m in metrics}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise ValueError(f"Table '{table}' has no metrics {unknown}")
+    return [m for m in metrics if m.name in set(names)]
+
+
+def evaluate_metrics(df, metrics):
+    """Evaluate metrics over df in one pass; returns a (rows x metrics) float64 array"""
+    inputs = list(dict.fromkeys(col for m in metrics for col in (m.numerator, m.denominator)))
+    position = {col: i for i, col in enumerate(inputs)}
+    block = df[inputs].to_numpy(dtype='float64')
+
+    numerators = block[:, [position[m.numerator] for m in metrics]]
+    denominators = block[:, [position[m.denominator] for m in metrics]]
+    valid = denominators > 0
+
+    fill = np.array([0.0 if m.zero_policy == 'zero' else np.nan for m in metrics])
+    result = np.broadcast_to(fill, numerators.shape).copy()
+    np.divide(numerators, denominators, out=result, where=valid)
+    result *= np.array([m.scale for m in metrics])
+    return result
+
+
+def compute_metrics(df, table, names=None):
+    """Add the requested metrics of table to df in place"""
+    metrics = table_metrics(table, names)
+    if not metrics:
+        return
+    values = evaluate_metrics(df, metrics)
+    for i, metric in enumerate(metrics):
+        df[metric.name] = values[:, i]
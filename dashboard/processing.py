@@ -0,0 +1,165 @@
+"""Per-table cleaning and derived metric computation"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from dashboard.metrics import compute_metrics, table_metrics
+from dashboard.parsing import parse_columns
+from dashboard.schema import TABLE_COLUMNS, TABLE_NAMES, validate_table
+
+# Formatted raw columns parsed to numbers: target column -> (source column, parser kind)
+PARSED_COLUMNS = {
+    'social': {'Spend_Clean': ('Spend (USD)', 'currency')},
+    'website': {},
+    'events': {'Event_Spend_Clean': ('Event spend for Dolby Play', 'currency')},
+    'monitoring': {
+        'Engagement_Rate_Clean': ('Engagement rate', 'percentage'),
+        'Share_of_Voice_Clean': ('Share of Voice', 'percentage'),
+    },
+    'brandpulse': {
+        'Score_Clean': ('Score', 'percentage'),
+        'Comp_Avg_Clean': ('Comp. avg.', 'percentage'),
+    },
+}
+
+# Tables longer than this are split into chunks of this many rows when
+# processed on a worker pool
+DEFAULT_CHUNK_ROWS = 250_000
+
+
+def derived_columns(table):
+    """Derived columns of table and the columns each one is computed from"""
+    validate_table(table)
+    derived = {target: [source] for target, (source, _) in PARSED_COLUMNS[table].items()}
+    for metric in table_metrics(table):
+        derived[metric.name] = [metric.numerator, metric.denominator]
+    return derived
+
+
+def resolve_dependencies(table, columns=None):
+    """Split the columns a view needs into raw columns to read and derived columns to compute
+
+    Derived columns are expanded recursively (CPM needs Spend_Clean, which
+    needs 'Spend (USD)'). None requests every raw and derived column.
+    """
+    derived_specs = derived_columns(table)
+    if columns is None:
+        return list(TABLE_COLUMNS[table]), set(derived_specs)
+
+    raw, derived = [], set()
+    pending = list(columns)
+    while pending:
+        column = pending.pop()
+        if column in derived_specs:
+            if column not in derived:
+                derived.add(column)
+                pending.extend(derived_specs[column])
+        elif column in TABLE_COLUMNS[table]:
+            if column not in raw:
+                raw.append(column)
+        else:
+            raise ValueError(f"Table '{table}' has no raw or derived column '{column}'")
+    # Keep the source's column order so projections are stable cache keys
+    raw.sort(key=TABLE_COLUMNS[table].index)
+    return raw, derived
+
+
+def process_table(table, df, derived=None):
+    """Compute derived columns of one table in place; returns its parse report
+
+    Formatted columns are parsed first, then every requested metric is
+    computed in a single batched pass. derived defaults to every derived
+    column of the table.
+    """
+    validate_table(table)
+    if derived is None:
+        derived = set(derived_columns(table))
+    report = parse_columns(df, {
+        source: (target, kind)
+        for target, (source, kind) in PARSED_COLUMNS[table].items()
+        if target in derived
+    })
+    compute_metrics(df, table, [m.name for m in table_metrics(table) if m.name in derived])
+    return report
+
+
+def make_executor(kind='process', workers=None):
+    """Worker pool for parallel processing: 'process' (scales parsing with cores) or 'thread'
+
+    workers defaults to the number of CPUs.
+    """
+    workers = workers or os.cpu_count() or 1
+    if kind == 'process':
+        return ProcessPoolExecutor(max_workers=workers)
+    if kind == 'thread':
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown executor kind '{kind}', expected 'process' or 'thread'")
+
+
+def _process_chunk(table, df, derived):
+    """process_table on one chunk, returning the chunk too (worker processes cannot edit in place)"""
+    report = process_table(table, df, derived)
+    return df, report
+
+
+def submit_table(executor, table, df, derived=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Queue one table on executor, split into chunks of at most chunk_rows rows
+
+    Parsing and metrics are row-wise, so processing chunks separately gives
+    exactly the rows of processing the whole table. Pass the returned
+    futures to collect_table.
+    """
+    validate_table(table)
+    chunk_rows = chunk_rows or len(df) or 1
+    chunks = [df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows)] or [df]
+    return [executor.submit(_process_chunk, table, chunk.copy(deep=False), derived) for chunk in chunks]
+
+
+def collect_table(futures):
+    """Processed frame and summed parse report of a table queued with submit_table"""
+    parts, reports = zip(*(future.result() for future in futures))
+    report = {}
+    for part_report in reports:
+        for column, count in part_report.items():
+            report[column] = report.get(column, 0) + count
+    return (parts[0] if len(parts) == 1 else pd.concat(parts)), report
+
+
+def process_tables(tables, executor, derived=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Process several tables concurrently on executor
+
+    tables maps table name -> raw frame and derived (optional) table name ->
+    derived columns. Every chunk of every table is queued before any result
+    is awaited. Returns ({table: processed frame}, {table: parse report});
+    the input frames are left untouched.
+    """
+    derived = derived or {}
+    futures = {table: submit_table(executor, table, df, derived.get(table), chunk_rows)
+               for table, df in tables.items()}
+    processed, reports = {}, {}
+    for table, table_futures in futures.items():
+        processed[table], reports[table] = collect_table(table_futures)
+    return processed, reports
+
+
+def process_data(social_df, website_df, events_df, monitoring_df, brandpulse_df, parse_report=None,
+                 executor=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Process and clean all datasets
+
+    If parse_report is given it is filled with the number of coerced cells
+    per table and column. With an executor (see make_executor) the tables,
+    and chunks of tables longer than chunk_rows, are processed concurrently
+    and new frames are returned instead of processing in place; the values
+    are identical to the serial path.
+    """
+    if parse_report is None:
+        parse_report = {}
+    frames = (social_df, website_df, events_df, monitoring_df, brandpulse_df)
+    if executor is not None:
+        processed, reports = process_tables(dict(zip(TABLE_NAMES, frames)), executor, chunk_rows=chunk_rows)
+        parse_report.update(reports)
+        return tuple(processed[table] for table in TABLE_NAMES)
+    for table, df in zip(TABLE_NAMES, frames):
+        parse_report[table] = process_table(table, df)
+    return frames
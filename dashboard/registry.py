@@ -0,0 +1,543 @@
+"""Lazy, dependency-aware registry of processed dashboard tables
+
+Each section declares the columns it plots per table. Only those tables are
+read (projected to the raw columns the requested derived columns depend on)
+and only those derived columns are computed. Results are cached on the raw
+content hash, so sections sharing a projection share the processed frame.
+
+Sections can be queried for a time window and granularity: the processed
+table is sorted by its time column once, the window is a binary-search
+slice of it and only that slice is rolled up. Windowed results are cached
+per (projection, range, granularity).
+
+A registry is shared by every session and thread of the process. Frames are
+built once under a lock and handed out as shallow copies: with pandas
+Copy-on-Write (always on from pandas 3, opted into by app.py on pandas 2)
+those are zero-copy views whose writes never reach the shared data. Without
+it they are deep copies.
+"""
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from dashboard.caching import (PROCESSING_VERSION, combine_fingerprints, frame_fingerprint, key_fingerprint,
+                               remember_fingerprint)
+from dashboard.cubes import brandpulse_cube, monitoring_cube
+from dashboard.funnel import FACT_COLUMNS, FactTable, fact_columns
+from dashboard.instrumentation import count, timed
+from dashboard.kpis import RunningKpis, kpi_columns
+from dashboard.processing import DEFAULT_CHUNK_ROWS, collect_table, process_table, resolve_dependencies, submit_table
+from dashboard.resampling import GRANULARITIES, rollup, slice_time_range, sort_by_time, table_time_range
+from dashboard.schema import TABLE_COLUMNS, TIME_COLUMNS, append_frames, compact_table, validate_columns
+from dashboard.streaming import GROUP_COLUMNS
+
+# Columns each dashboard section reads, per table (raw or derived)
+SECTION_REQUIREMENTS = {
+    'overview': {
+        'social': ['Month', 'Spend_Clean', 'Attributed sweeps signups on dolby.com', 'CTR'],
+        'website': ['Month', 'Website visits'],
+    },
+    'social': {
+        # Ratio inputs are included so rollups can recompute the ratios
+        'social': ['Month', 'Spend_Clean', 'Impressions', 'Clicks to dolby.com landing',
+                   'Attributed sweeps signups on dolby.com',
+                   'CTR', 'Click_to_Signup_Rate', 'CPM', 'CPC', 'CPSignup'],
+    },
+    'website': {
+        'website': ['Month', 'Website visits', 'Uniques', 'Average session duration (min)',
+                    'Demos completed', 'Total sweeps signups',
+                    'Unique_to_Demo_Rate', 'Demo_to_Signup_Rate'],
+    },
+    'events': {
+        'events': ['Month', 'Industry Event', 'Event_Spend_Clean',
+                   '# demos of Dolby Play conducted for mobile device partner contacts',
+                   '# new mobile device partner leads generated',
+                   'CPDemo', 'CPL', 'Demo_to_Lead_Rate'],
+    },
+    'monitoring': {
+        'monitoring': ['Month', 'Platform', 'Followers', 'Engagement_Rate_Clean',
+                       'Sentiment Score', 'Share_of_Voice_Clean'],
+    },
+    'brandpulse': {
+        'brandpulse': ['Quarter', 'Metric', 'Age Group', 'Gender', 'Score_Clean', 'Comp_Avg_Clean'],
+    },
+    # Read through the joined fact table (see facts())
+    'funnel': fact_columns(),
+}
+
+# Sections filtered interactively get a cube over one table: section -> (table, builder)
+SECTION_CUBES = {
+    'monitoring': ('monitoring', monitoring_cube),
+    'brandpulse': ('brandpulse', brandpulse_cube),
+}
+
+
+# Windowed results (section tables, cubes, KPIs) kept per registry, oldest dropped first
+WINDOW_CACHE_ENTRIES = 64
+
+
+def _copy_on_write():
+    """Whether pandas Copy-on-Write is in effect (always from pandas 3)"""
+    return int(pd.__version__.split('.')[0]) >= 3 or pd.get_option('mode.copy_on_write') is True
+
+
+def session_view(df, fingerprint=None):
+    """Write-isolated view of a shared frame: zero-copy under Copy-on-Write, a deep copy otherwise
+
+    fingerprint, when the caller's cache key already identifies the frame's
+    content, is remembered for the view so figure caches need not hash it
+    (see caching.remember_fingerprint).
+    """
+    view = df.copy(deep=not _copy_on_write())
+    if fingerprint is not None:
+        remember_fingerprint(view, fingerprint)
+    return view
+
+
+class DatasetRegistry:
+    """Materializes processed tables on first use and caches them
+
+    Only the processed frames (compact dtypes, requested columns) are kept;
+    raw reads are fingerprinted and discarded. Safe for concurrent use:
+    lookups of built frames take no lock, builds are serialized.
+
+    With an executor (see processing.make_executor) the tables of a section
+    are processed concurrently, and tables longer than chunk_rows are split
+    into chunks processed in parallel.
+
+    start and end ("2025-01", inclusive) bound every read from the source,
+    so rows outside them are never read or parsed (see DataSource.read_table).
+    """
+
+    def __init__(self, source, executor=None, chunk_rows=DEFAULT_CHUNK_ROWS, start=None, end=None):
+        self.source = source
+        self.executor = executor
+        self.chunk_rows = chunk_rows
+        self.start = start
+        self.end = end
+        self._fingerprints = {} # (table, raw columns) -> content hash of the raw read
+        self._processed = {}    # (version, table, content hash, columns) -> frame
+        self._reports = {}      # table -> {column: coerced cells}
+        self._memory = {}       # processed key -> {'before': bytes, 'after': bytes}
+        self._cubes = {}        # (section, processed key) -> cube
+        self._resolved = {}     # (table, requested columns) -> processed key
+        self._appended = {}     # table -> raw batches appended since the source was read
+        self._kpis = None       # RunningKpis, built on first use
+        self._facts = None      # FactTable, built on first use
+        self._sorted = {}       # processed key -> frame sorted by its time column
+        self._windows = OrderedDict()   # (kind, ..., start, end, granularity) -> windowed result
+        self._lock = threading.RLock()
+
+    def table(self, table, columns=None):
+        """View of the processed table restricted to columns (None for every raw and derived column)"""
+        key, frame = self._resolve(table, columns)
+        return session_view(frame, key_fingerprint('table', key))
+
+    def _resolve(self, table, columns):
+        """Cache key and processed frame of a projection, materializing it if needed"""
+        key = self._materialize(table, columns)
+        frame = self._processed.get(key)
+        if frame is None:
+            # Superseded by a concurrent append: resolve the new key under the lock
+            with self._lock:
+                key = self._materialize(table, columns)
+                frame = self._processed[key]
+        return key, frame
+
+    def _materialize(self, table, columns):
+        """Make sure the processed table is cached and return its cache key"""
+        request = (table, tuple(columns) if columns is not None else None)
+        key = self._resolved.get(request)
+        if key is not None:
+            count('registry_hits')
+            return key
+        count('registry_misses')
+        with self._lock:
+            key = self._build(table, columns)
+            self._resolved[request] = key
+            return key
+
+    def _build(self, table, columns):
+        """Read, process and compact one table projection (caller holds the lock)"""
+        key, pending = self._prepare(table, columns)
+        if pending is not None:
+            raw_df, derived = pending
+            with timed('process', table=table, rows=len(raw_df)):
+                if self.executor is not None and len(raw_df) > self.chunk_rows:
+                    raw_df, report = collect_table(submit_table(self.executor, table, raw_df, derived, self.chunk_rows))
+                else:
+                    report = process_table(table, raw_df, derived)
+            self._store(key, raw_df, report)
+        return key
+
+    def _prepare(self, table, columns):
+        """Processed key of a projection, plus (raw frame, derived columns) if it still has to be built"""
+        raw_columns, derived = resolve_dependencies(table, columns)
+        raw_key = (table, tuple(raw_columns))
+        raw_df = None
+        if raw_key not in self._fingerprints:
+            raw_df = self._read_raw(table, raw_columns)
+            self._fingerprints[raw_key] = frame_fingerprint(raw_df)
+
+        output_columns = tuple(columns) if columns is not None else tuple(raw_columns) + tuple(sorted(derived))
+        key = (PROCESSING_VERSION, table, self._fingerprints[raw_key], output_columns)
+        if key in self._processed:
+            return key, None
+        if raw_df is None:
+            raw_df = self._read_raw(table, raw_columns)
+        return key, (raw_df, derived)
+
+    def _store(self, key, processed_df, report):
+        """Compact and cache a processed projection (caller holds the lock)"""
+        table, output_columns = key[1], key[3]
+        self._reports.setdefault(table, {}).update(report)
+        # Only the requested columns are kept, so raw strings parsed into
+        # *_Clean columns are dropped along with the raw frame
+        with timed('compact', table=table):
+            self._processed[key], self._memory[key] = compact_table(table, processed_df[list(output_columns)])
+
+    def prefetch(self, sections=None):
+        """Materialize the tables of several sections (all by default) in one batch
+
+        With an executor every missing table, chunked as needed, is queued
+        before any result is awaited, so independent tables are processed
+        concurrently. Without one this is the serial path.
+        """
+        requests = []
+        for section in sections or SECTION_REQUIREMENTS:
+            if section not in SECTION_REQUIREMENTS:
+                raise ValueError(f"Unknown section '{section}'")
+            for table, columns in SECTION_REQUIREMENTS[section].items():
+                request = (table, tuple(columns))
+                if request not in self._resolved and request not in requests:
+                    requests.append(request)
+        if not requests:
+            return
+        with self._lock:
+            if self.executor is None:
+                for table, columns in requests:
+                    self._materialize(table, columns)
+                return
+            queued = {}     # processed key -> (table, futures)
+            keys = {}       # request -> processed key
+            for table, columns in requests:
+                key, pending = self._prepare(table, columns)
+                keys[(table, columns)] = key
+                if pending is not None and key not in queued:
+                    raw_df, derived = pending
+                    queued[key] = submit_table(self.executor, table, raw_df, derived, self.chunk_rows)
+            for key, futures in queued.items():
+                with timed('process', table=key[1]):
+                    processed = collect_table(futures)
+                self._store(key, *processed)
+            self._resolved.update(keys)
+
+    def _read_raw(self, table, raw_columns):
+        """Raw projection from the source plus any batches appended since"""
+        with timed('load', table=table):
+            start, end = table_time_range(table, self.start, self.end)
+            raw_df = self.source.read_table(table, raw_columns, start=start, end=end)
+            batches = self._appended.get(table)
+            if batches:
+                raw_df = pd.concat([raw_df] + [batch[raw_columns] for batch in batches], ignore_index=True)
+        return raw_df
+
+    def append(self, table, batch):
+        """Append new raw rows (e.g. one month) to table without reprocessing its history
+
+        Every cached projection of table is extended with the processed
+        batch: only the new rows are parsed and have their metrics computed.
+        KPI aggregates are updated from the batch alone. Cubes over table
+        are rebuilt on next use.
+        """
+        validate_columns(table, batch.columns, source='appended batch')
+        batch = batch[TABLE_COLUMNS[table]].reset_index(drop=True)
+        with self._lock:
+            self._appended.setdefault(table, []).append(batch)
+
+            batch_fingerprints = {}
+            for raw_key, fingerprint in list(self._fingerprints.items()):
+                if raw_key[0] == table:
+                    batch_fingerprints[raw_key] = frame_fingerprint(batch[list(raw_key[1])])
+                    self._fingerprints[raw_key] = combine_fingerprints(fingerprint, batch_fingerprints[raw_key])
+
+            batch_report = {}
+            updated = {}    # old processed key -> new processed key
+            for request, key in list(self._resolved.items()):
+                if request[0] != table:
+                    continue
+                if key not in updated:
+                    raw_columns, derived = resolve_dependencies(table, request[1])
+                    part = batch[raw_columns].copy()
+                    batch_report.update(process_table(table, part, derived))
+                    output_columns = key[3]
+                    compacted, memory = compact_table(table, part[list(output_columns)])
+
+                    new_key = key[:2] + (self._fingerprints[(table, tuple(raw_columns))], output_columns)
+                    self._processed[new_key] = append_frames(self._processed[key], compacted)
+                    previous = self._memory.pop(key)
+                    self._memory[new_key] = {name: previous[name] + memory[name] for name in memory}
+                    updated[key] = new_key
+                self._resolved[request] = updated[key]
+
+            # Superseded frames go only after every request points at the new
+            # ones, so lock-free readers never see a missing key
+            for key in updated:
+                del self._processed[key]
+                self._sorted.pop(key, None)
+                for cube_key in [k for k in self._cubes if k[1] == key]:
+                    del self._cubes[cube_key]
+
+            report = self._reports.setdefault(table, {})
+            for column, count in batch_report.items():
+                report[column] = report.get(column, 0) + count
+
+            if self._kpis is not None and table in kpi_columns():
+                raw_columns, derived = resolve_dependencies(table, kpi_columns()[table])
+                part = batch[raw_columns].copy()
+                process_table(table, part, derived)
+                self._kpis.update(table, part)
+
+            if self._facts is not None and table in FACT_COLUMNS:
+                raw_columns, derived = resolve_dependencies(table, fact_columns()[table])
+                part = batch[raw_columns].copy()
+                process_table(table, part, derived)
+                self._facts.update(table, compact_table(table, part)[0])
+
+    def appended(self):
+        """Raw batches appended since the source was read: {table: [batch, ...]} in append order"""
+        with self._lock:
+            return {table: list(batches) for table, batches in self._appended.items()}
+
+    def kpis(self, start=None, end=None):
+        """Overview KPI values (see dashboard.kpis), maintained incrementally
+
+        With start or end the KPIs cover only that window, computed from the
+        sliced tables and cached per window.
+        """
+        if start is not None or end is not None:
+            resolved = [self._resolve(table, [TIME_COLUMNS[table]] + columns)
+                        for table, columns in kpi_columns().items()]
+
+            def build():
+                running = RunningKpis()
+                for key, frame in resolved:
+                    running.update(key[1], self._slice(key, frame, start, end))
+                return running.values()
+            keys = tuple(key for key, _ in resolved)
+            return dict(self._cached_window(('kpis', keys, start, end, None), build))
+        if self._kpis is None:
+            with self._lock:
+                if self._kpis is None:
+                    running = RunningKpis()
+                    for table, columns in kpi_columns().items():
+                        running.update(table, self._processed[self._materialize(table, columns)])
+                    self._kpis = running
+        with self._lock:
+            return self._kpis.values()
+
+    def facts(self, start=None, end=None, granularity=None):
+        """Month-indexed fact table joining social, website and events, with funnel rates (see dashboard.funnel)
+
+        Joined once from the processed tables and updated in place by
+        append(). start, end and granularity return a cached window of it,
+        rolled up with the rates recomputed from the summed stages.
+        """
+        if self._facts is None:
+            with self._lock:
+                if self._facts is None:
+                    keys = {table: self._materialize(table, columns) for table, columns in fact_columns().items()}
+                    with timed('facts_build'):
+                        facts = FactTable()
+                        for table, key in keys.items():
+                            facts.update(table, self._processed[key])
+                        facts.frame()
+                    self._facts = facts
+        with self._lock:
+            frame, version = self._facts.frame(), self._facts.version
+        fingerprint = frame_fingerprint(frame)  # remembered by FactTable.frame, not rehashed
+        if start is None and end is None and granularity is None:
+            return session_view(frame, fingerprint)
+        if granularity is not None and granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity '{granularity}', expected one of {', '.join(GRANULARITIES)}")
+
+        def build():
+            df = slice_time_range(frame, 'Month', start, end)
+            if granularity is None:
+                return df
+            rolled = rollup(df, 'funnel', 'Month', granularity)
+            rolled.attrs['table'] = 'funnel'
+            return rolled
+        return session_view(self._cached_window(('facts', id(self._facts), version, start, end, granularity), build),
+                            key_fingerprint('facts', fingerprint, start, end, granularity))
+
+    def section(self, section, start=None, end=None, granularity=None):
+        """Processed tables a dashboard section needs, keyed by table name
+
+        start, end and granularity restrict them to a window (see window).
+        """
+        if section not in SECTION_REQUIREMENTS:
+            raise ValueError(f"Unknown section '{section}'")
+        if self.executor is not None and len(SECTION_REQUIREMENTS[section]) > 1:
+            self.prefetch([section])
+        if start is None and end is None and granularity is None:
+            return {
+                table: self.table(table, columns)
+                for table, columns in SECTION_REQUIREMENTS[section].items()
+            }
+        return {
+            table: self.window(table, columns, start, end, granularity)
+            for table, columns in SECTION_REQUIREMENTS[section].items()
+        }
+
+    def window(self, table, columns, start=None, end=None, granularity=None):
+        """View of a processed table within the inclusive [start, end] months, rolled up to granularity
+
+        Month tables are rolled up per period (and per label, e.g. Platform)
+        as resampling.rollup does; granularity does not apply to Quarter
+        tables. None keeps every bound and the stored granularity.
+        """
+        if granularity is not None and granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity '{granularity}', expected one of {', '.join(GRANULARITIES)}")
+        key, frame = self._resolve(table, columns)
+        window_key = ('table', key, start, end, granularity)
+        return session_view(self._cached_window(window_key, lambda: self._rollup(key, frame, start, end, granularity)),
+                            key_fingerprint(*window_key))
+
+    def _slice(self, key, frame, start, end):
+        """Rows of a processed frame (cached under key) within [start, end], by binary search on its time column"""
+        time_column = TIME_COLUMNS[key[1]]
+        ordered = self._sorted.get(key)
+        if ordered is None:
+            with self._lock:
+                ordered = self._sorted.get(key)
+                if ordered is None:
+                    ordered = sort_by_time(frame, time_column)
+                    # A key superseded by a concurrent append is not cached again
+                    if key in self._processed:
+                        self._sorted[key] = ordered
+        return slice_time_range(ordered, time_column, start, end)
+
+    def _rollup(self, key, frame, start, end, granularity):
+        """Window of a processed frame, rolled up to granularity when its time column is Month"""
+        table = key[1]
+        df = self._slice(key, frame, start, end)
+        if granularity is None or TIME_COLUMNS[table] != 'Month':
+            return df
+        by = [col for col in GROUP_COLUMNS[table] if col in df.columns]
+        rolled = rollup(df, table, 'Month', granularity, by=by[0] if by else None)
+        rolled.attrs['table'] = table
+        return rolled
+
+    def _cached_window(self, window_key, build):
+        """Cached result of build() for a window key, built once under the lock"""
+        result = self._windows.get(window_key)
+        if result is not None:
+            count('window_hits')
+            return result
+        count('window_misses')
+        with self._lock:
+            if window_key not in self._windows:
+                with timed('window', kind=window_key[0], start=window_key[-3], end=window_key[-2],
+                           granularity=window_key[-1]):
+                    self._windows[window_key] = build()
+                while len(self._windows) > WINDOW_CACHE_ENTRIES:
+                    self._windows.popitem(last=False)
+            return self._windows[window_key]
+
+    def periods(self, section=None):
+        """Sorted months ("2025-01") present in the tables of section (None for every section)
+
+        Read from the section's own projections, so asking for one section's
+        periods loads nothing the section does not need. A quarter counts as
+        its first month.
+        """
+        sections = [section] if section is not None else list(SECTION_REQUIREMENTS)
+        resolved = dict(self._resolve(table, columns)
+                        for name in sections for table, columns in SECTION_REQUIREMENTS[name].items())
+
+        def build():
+            months = set()
+            for key, frame in resolved.items():
+                values = pd.Series(frame[TIME_COLUMNS[key[1]]].dropna().unique())
+                if TIME_COLUMNS[key[1]] == 'Quarter':
+                    months.update(pd.Period(label.replace(' ', ''), freq='Q').asfreq('M', 'start').strftime('%Y-%m')
+                                  for label in values)
+                else:
+                    months.update(values.dt.strftime('%Y-%m'))
+            return sorted(months)
+        return list(self._cached_window(('periods', tuple(resolved), None, None, None), build))
+
+    def cube(self, section, start=None, end=None, granularity=None):
+        """Filterable cube over the table of an interactively filtered section
+
+        start, end and granularity build it over a window of the table (see
+        window); windowed cubes are cached per window.
+        """
+        if section not in SECTION_CUBES:
+            raise ValueError(f"Section '{section}' has no cube")
+        table, build = SECTION_CUBES[section]
+        if start is not None or end is not None or granularity is not None:
+            columns = SECTION_REQUIREMENTS[section][table]
+            frame = self.window(table, columns, start, end, granularity)
+            key = self._materialize(table, columns)
+            window_key = ('cube', section, key, start, end, granularity)
+            return self._cached_window(window_key, lambda: self._fingerprinted(build(frame), window_key))
+        cube = self._cubes.get((section, self._materialize(table, SECTION_REQUIREMENTS[section][table])))
+        if cube is not None:
+            count('cube_hits')
+            return cube
+        count('cube_misses')
+        with self._lock:
+            key = (section, self._materialize(table, SECTION_REQUIREMENTS[section][table]))
+            if key not in self._cubes:
+                with timed('cube_build', section=section):
+                    self._cubes[key] = self._fingerprinted(build(self._processed[key[1]]), ('cube',) + key)
+            return self._cubes[key]
+
+    @staticmethod
+    def _fingerprinted(cube, cube_key):
+        """Give a cube the fingerprint of its cache key, so its selections are never hashed"""
+        cube.fingerprint = key_fingerprint(*cube_key)
+        return cube
+
+    def parse_report(self):
+        """Coerced cell counts for every table materialized so far
+
+        Cells the source parsed while reading (see DataSource.parse_report,
+        e.g. streamed rollups) are added to those parsed here.
+        """
+        with self._lock:
+            reports = {table: dict(report) for table, report in self._reports.items()}
+        for table, report in reports.items():
+            for column, count in self.source.parse_report(table).items():
+                report[column] = report.get(column, 0) + count
+        return reports
+
+    def memory_report(self):
+        """Bytes of the cached processed frames before and after dtype compaction, in total and per table"""
+        with self._lock:
+            tables = {}
+            for key, report in self._memory.items():
+                tables[key[1]] = tables.get(key[1], 0) + report['after']
+            return {
+                'before': sum(report['before'] for report in self._memory.values()),
+                'after': sum(report['after'] for report in self._memory.values()),
+                'tables': tables,
+            }
+
+    def clear(self):
+        """Drop every cached raw and processed frame"""
+        with self._lock:
+            self._resolved.clear()
+            self._appended.clear()
+            self._kpis = None
+            self._facts = None
+            self._sorted.clear()
+            self._windows.clear()
+            self._fingerprints.clear()
+            self._processed.clear()
+            self._reports.clear()
+            self._memory.clear()
+            self._cubes.clear()
@@ -0,0 +1,216 @@
+"""Server-side rollups and downsampling for time-series charts
+
+Charts never need more points than the browser can draw. Before a figure is
+built its frame is rolled up to the finest granularity (daily, weekly,
+monthly) that fits the point budget, aggregating each column the way it
+should be aggregated and recomputing ratio metrics from summed numerators
+and denominators. Series that still exceed the budget are thinned with
+Largest-Triangle-Three-Buckets (LTTB), which keeps the visual shape.
+"""
+import numpy as np
+import pandas as pd
+
+from dashboard.metrics import DEMOS, LEADS, evaluate_metrics, table_metrics
+from dashboard.schema import TIME_COLUMNS
+
+# Default per-trace point budget for chart builders
+DEFAULT_MAX_POINTS = 2000
+
+# Granularity -> pandas period frequency, finest first
+GRANULARITIES = {
+    'daily': 'D',
+    'weekly': 'W',
+    'monthly': 'M',
+    'quarterly': 'Q',
+    'yearly': 'Y',
+}
+
+# Granularities auto_rollup picks from; coarser ones are only used on request
+AUTO_GRANULARITIES = ('daily', 'weekly', 'monthly')
+
+# How additive and point-in-time columns combine within a period.
+# Ratio metrics are not listed: they are recomputed from their inputs.
+AGGREGATIONS = {
+    'Spend_Clean': 'sum',
+    'Impressions': 'sum',
+    'Clicks to dolby.com landing': 'sum',
+    'Attributed sweeps signups on dolby.com': 'sum',
+    'Website visits': 'sum',
+    'Uniques': 'sum',
+    'Average session duration (min)': 'mean',
+    'Demos completed': 'sum',
+    'Total sweeps signups': 'sum',
+    'Followers': 'last',
+    'Engagement_Rate_Clean': 'mean',
+    'Mentions': 'sum',
+    'Sentiment Score': 'mean',
+    'Share_of_Voice_Clean': 'mean',
+    'Event_Spend_Clean': 'sum',
+    DEMOS: 'sum',
+    LEADS: 'sum',
+    'Score_Clean': 'mean',
+    'Comp_Avg_Clean': 'mean',
+    'Total_Spend': 'sum',
+    'Total_Demos': 'sum',
+}
+
+
+def period_starts(times, granularity):
+    """Map each timestamp to the start of its period (first day of the month for monthly)"""
+    return times.dt.to_period(GRANULARITIES[granularity]).dt.start_time
+
+
+def time_granularity(times):
+    """Coarsest granularity whose period starts include every value of times (None if none does)"""
+    values = pd.Series(pd.to_datetime(pd.unique(times.dropna())))
+    for granularity in reversed(GRANULARITIES):
+        if (period_starts(values, granularity) == values).all():
+            return granularity
+    return None
+
+
+def rollup(df, table, time_column, granularity, by=None):
+    """Aggregate df to one row per period (and per by group)
+
+    Columns are combined per AGGREGATIONS; ratio metrics of table are
+    recomputed from their aggregated numerators and denominators, or
+    averaged when those inputs are not in df. Other columns are dropped.
+    A granularity finer than the data's own (weekly on monthly data) is
+    replaced by the data's, so no period moves to an earlier date.
+    """
+    native = time_granularity(df[time_column])
+    if native is not None and list(GRANULARITIES).index(granularity) < list(GRANULARITIES).index(native):
+        granularity = native
+    keys = [time_column] + ([by] if by else [])
+    metrics = [m for m in table_metrics(table) if m.name in df.columns]
+    recomputed = [m for m in metrics
+                  if AGGREGATIONS.get(m.numerator) == 'sum' and AGGREGATIONS.get(m.denominator) == 'sum'
+                  and m.numerator in df.columns and m.denominator in df.columns]
+    aggregations = {col: how for col, how in AGGREGATIONS.items() if col in df.columns and col not in keys}
+    aggregations.update({m.name: 'mean' for m in metrics if m not in recomputed})
+
+    grouped = df.assign(**{time_column: period_starts(pd.to_datetime(df[time_column]), granularity)})
+    out = grouped.groupby(keys, sort=True, observed=True).agg(aggregations).reset_index()
+    # A period whose values of a summed column are all missing stays missing
+    # rather than summing to 0 (e.g. a month without website rows in the facts)
+    summed = [col for col, how in aggregations.items() if how == 'sum']
+    if summed and df[summed].isna().to_numpy().any():
+        present = grouped.groupby(keys, sort=True, observed=True)[summed].count().to_numpy() > 0
+        out[summed] = out[summed].where(present)
+    if recomputed:
+        values = evaluate_metrics(out, recomputed)
+        for i, metric in enumerate(recomputed):
+            out[metric.name] = values[:, i]
+    return out
+
+
+def auto_rollup(df, table, time_column, max_points=DEFAULT_MAX_POINTS, by=None):
+    """Roll df up to the finest granularity with at most max_points periods
+
+    Frames with one row per timestamp (per by group) that already fit the
+    budget are returned unchanged. Repeated timestamps are always
+    aggregated, so a chart never draws several raw rows per period. Data
+    still too dense at monthly granularity after rolling up is returned
+    monthly (LTTB downsampling takes over from there).
+    """
+    repeated = df.duplicated([time_column] + ([by] if by else [])).any()
+    if not repeated and df[time_column].nunique() <= max_points:
+        return df
+    times = pd.to_datetime(df[time_column])
+    for granularity in AUTO_GRANULARITIES:
+        if times.dt.to_period(GRANULARITIES[granularity]).nunique() <= max_points:
+            return rollup(df, table, time_column, granularity, by=by)
+    return rollup(df, table, time_column, 'monthly', by=by)
+
+
+def quarter_label(value):
+    """Quarter label ("2025 Q1") of a month or day ("2025-02", "2025-02-14"); labels pass through"""
+    if 'Q' in str(value):
+        return value
+    period = pd.Period(value, freq='Q')
+    return f"{period.year} Q{period.quarter}"
+
+
+def table_time_range(table, start=None, end=None):
+    """Inclusive [start, end] month bounds ("2025-01") as bounds on table's time column
+
+    Quarter tables get the quarters containing start and end. Month columns
+    compare as strings, so end is widened to the last possible day label of
+    its month ("2025-03" -> "2025-03-31") to keep daily rows of that month.
+    """
+    if TIME_COLUMNS[table] == 'Quarter':
+        return (None if start is None else quarter_label(start)), (None if end is None else quarter_label(end))
+    if end is not None and len(str(end)) == 7:
+        end = f"{end}-31"
+    return start, end
+
+
+def sort_by_time(df, time_column):
+    """df ordered by time_column (stable); df itself if it already is"""
+    values = df[time_column]
+    ordered = values.cat.codes if isinstance(values.dtype, pd.CategoricalDtype) else values
+    if ordered.is_monotonic_increasing:
+        return df
+    return df.sort_values(time_column, kind='stable').reset_index(drop=True)
+
+
+def slice_time_range(df, time_column, start=None, end=None):
+    """Rows of df (sorted by time_column, see sort_by_time) within the inclusive [start, end] range
+
+    Bounds are months or days ("2025-01", "2025-01-15"); end includes its
+    whole period. They are located by binary search on the sorted column,
+    so the result is one zero-copy slice instead of a mask over every row.
+    Quarter columns (ordered categoricals of "2025 Q1" labels) are matched
+    on the quarters of start and end.
+    """
+    values = df[time_column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories
+        codes = values.cat.codes
+        low = codes.searchsorted(0 if start is None else categories.searchsorted(quarter_label(start)))
+        high = len(df) if end is None else codes.searchsorted(
+            categories.searchsorted(quarter_label(end), side='right'))
+    else:
+        low = 0 if start is None else values.searchsorted(pd.Period(start).start_time)
+        high = len(df) if end is None else values.searchsorted(pd.Period(end).end_time, side='right')
+    return df.iloc[low:high]
+
+
+def lttb_indices(y, threshold):
+    """Indices of the points LTTB keeps when reducing y to threshold points
+
+    x is taken to be the point position, i.e. evenly spaced samples.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    y = np.asarray(y, dtype='float64')
+    x = np.arange(n, dtype='float64')
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean() if next_end > end else x[-1]
+        avg_y = y[end:next_end].mean() if next_end > end else y[-1]
+        # Pick the point of this bucket forming the largest triangle with the
+        # previously selected point and the next bucket's average
+        areas = np.abs((x[selected] - avg_x) * (y[start:end] - y[selected])
+                       - (x[selected] - x[start:end]) * (avg_y - y[selected]))
+        selected = start + int(np.argmax(areas))
+        indices[i + 1] = selected
+    return indices
+
+
+def downsample(df, y, max_points=DEFAULT_MAX_POINTS, by=None):
+    """Rows of df kept when each (by group's) y series is thinned to max_points"""
+    if len(df) <= max_points:
+        return df
+    if by is None:
+        return df.iloc[lttb_indices(df[y].to_numpy(), max_points)]
+    parts = [group.iloc[lttb_indices(group[y].to_numpy(), max_points)]
+             for _, group in df.groupby(by, sort=False, observed=True)]
+    return pd.concat(parts)
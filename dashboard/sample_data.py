@@ -0,0 +1,138 @@
+"""Sample marketing data used when no data directory is configured"""
+import pandas as pd
+
+
+def load_sample_data():
+    """Build the six-month sample tables, keyed by table name"""
+    # B2C Social Media Performance Data
+    social_data = {
+        'Month': ['2025-01', '2025-02', '2025-03', '2025-04', '2025-05', '2025-06'],
+        'Spend (USD)': ['$125,441', '$126,198', '$120,458', '$125,973', '$125,412', '$120,042'],
+        'Impressions': [12464777, 12975553, 12962575, 12401415, 13055242, 13234155],
+        'Clicks to dolby.com landing': [90818, 101975, 102106, 101072, 107627, 114475],
+        'Attributed sweeps signups on dolby.com': [4025, 4560, 4757, 4862, 5186, 5480]
+    }
+    
+    # B2C Website Engagement Data
+    website_data = {
+        'Month': ['2025-01', '2025-02', '2025-03', '2025-04', '2025-05', '2025-06'],
+        'Website visits': [2450685, 2680483, 2920086, 3180870, 3460175, 3780668],
+        'Uniques': [1680842, 1820119, 1980005, 2150509, 2340491, 2550671],
+        'Average session duration (min)': [2.5, 2.6, 2.5, 2.8, 2.9, 2.6],
+        'Demos completed': [42509, 42007, 46105, 48304, 60802, 63608],
+        'Total sweeps signups': [10827, 11745, 12767, 13183, 13860, 14862]
+    }
+    
+    # B2B Industry Events Data
+    events_data = {
+        'Month': ['2025-01', '2025-02', '2025-03', '2025-05'],
+        'Industry Event': ['CES', 'Mobile World Congress', 'SXSW', 'Game Asia'],
+        'Event spend for Dolby Play': ['$750,000', '$250,000', '$250,000', '$650,000'],
+        '# demos of Dolby Play conducted for mobile device partner contacts': [75, 55, 60, 60],
+        '# new mobile device partner leads generated': [15, 5, 3, 5]
+    }
+    
+    # Social Media Monitoring Data
+    monitoring_data = {
+        'Month': ['2025-01', '2025-02', '2025-03', '2025-04', '2025-05', '2025-06'] * 3,
+        'Platform': ['Instagram']*6 + ['LinkedIn']*6 + ['TikTok']*6,
+        'Followers': [420068, 432010, 435100, 440089, 445035, 450047, 
+                     95019, 96057, 96027, 97054, 97083, 97079,
+                     80084, 83046, 85010, 87003, 93050, 96063],
+        'Engagement rate': ['3.60%', '3.70%', '3.70%', '4.10%', '4.00%', '4.30%',
+                           '2.20%', '1.90%', '1.80%', '1.80%', '1.90%', '2.00%',
+                           '4.20%', '4.50%', '4.80%', '5.10%', '5.40%', '5.70%'],
+        'Mentions': [5884, 6440, 6537, 6345, 6893, 6749,
+                    1960, 1398, 1442, 1223, 1870, 1154,
+                    3214, 3680, 4165, 4333, 4699, 4713],
+        'Sentiment Score': [0.68, 0.71, 0.73, 0.72, 0.69, 0.72,
+                           0.81, 0.76, 0.77, 0.75, 0.8, 0.77,
+                           0.72, 0.74, 0.76, 0.78, 0.8, 0.82],
+        'Share of Voice': ['15.70%', '16.80%', '16.30%', '15.60%', '17.30%', '17.40%',
+                          '10.20%', '6.80%', '7.50%', '6.00%', '9.10%', '6.60%',
+                          '8.90%', '9.80%', '10.90%', '12.10%', '13.50%', '15.00%']
+    }
+    
+    # Brand Pulse Survey Data - Fixed the data structure
+    quarters = ['2024 Q4', '2025 Q1', '2025 Q2']
+    metrics = ['Aided Awareness', 'Purchase Consideration', 'Unaided Awareness']
+    age_groups = ['18-34', '35-54']
+    genders = ['Female', 'Male']
+    
+    brandpulse_data = {
+        'Quarter': [],
+        'Metric': [],
+        'Age Group': [],
+        'Gender': [],
+        'Score': [],
+        'Comp. avg.': []
+    }
+    
+    # Sample data for brand pulse survey
+    sample_scores = {
+        'Aided Awareness': {
+            ('18-34', 'Female'): [52.8, 57.2, 60.1],
+            ('18-34', 'Male'): [67.2, 67.4, 68.1],
+            ('35-54', 'Female'): [59.6, 63.6, 69.3],
+            ('35-54', 'Male'): [72.4, 71.3, 73.1]
+        },
+        'Purchase Consideration': {
+            ('18-34', 'Female'): [23.4, 25.5, 28.3],
+            ('18-34', 'Male'): [34.8, 34.3, 37.0],
+            ('35-54', 'Female'): [27.4, 32.9, 37.3],
+            ('35-54', 'Male'): [36.0, 39.2, 41.1]
+        },
+        'Unaided Awareness': {
+            ('18-34', 'Female'): [19.6, 21.2, 23.8],
+            ('18-34', 'Male'): [23.2, 24.5, 24.9],
+            ('35-54', 'Female'): [19.5, 23.3, 25.5],
+            ('35-54', 'Male'): [28.4, 29.3, 29.2]
+        }
+    }
+    
+    sample_comp_avg = {
+        'Aided Awareness': {
+            ('18-34', 'Female'): [54.7, 56.8, 58.9],
+            ('18-34', 'Male'): [58.3, 60.1, 62.1],
+            ('35-54', 'Female'): [60.1, 62.9, 65.2],
+            ('35-54', 'Male'): [63.2, 65.4, 67.8]
+        },
+        'Purchase Consideration': {
+            ('18-34', 'Female'): [25.6, 27.1, 28.9],
+            ('18-34', 'Male'): [28.9, 30.2, 32.1],
+            ('35-54', 'Female'): [31.8, 34.5, 36.8],
+            ('35-54', 'Male'): [35.2, 37.8, 40.2]
+        },
+        'Unaided Awareness': {
+            ('18-34', 'Female'): [16.2, 17.1, 18.3],
+            ('18-34', 'Male'): [18.5, 19.2, 20.1],
+            ('35-54', 'Female'): [19.8, 21.2, 22.7],
+            ('35-54', 'Male'): [22.1, 23.5, 24.8]
+        }
+    }
+    
+    for metric in metrics:
+        for age_group in age_groups:
+            for gender in genders:
+                for i, quarter in enumerate(quarters):
+                    brandpulse_data['Quarter'].append(quarter)
+                    brandpulse_data['Metric'].append(metric)
+                    brandpulse_data['Age Group'].append(age_group)
+                    brandpulse_data['Gender'].append(gender)
+                    brandpulse_data['Score'].append(f"{sample_scores[metric][(age_group, gender)][i]:.1f}%")
+                    brandpulse_data['Comp. avg.'].append(f"{sample_comp_avg[metric][(age_group, gender)][i]:.1f}%")
+    
+    # Convert to DataFrames
+    social_df = pd.DataFrame(social_data)
+    website_df = pd.DataFrame(website_data)
+    events_df = pd.DataFrame(events_data)
+    monitoring_df = pd.DataFrame(monitoring_data)
+    brandpulse_df = pd.DataFrame(brandpulse_data)
+    
+    return {
+        'social': social_df,
+        'website': website_df,
+        'events': events_df,
+        'monitoring': monitoring_df,
+        'brandpulse': brandpulse_df,
+    }
@@ -0,0 +1,154 @@
+"""Logical table definitions shared by every data source"""
+import numpy as np
+import pandas as pd
+
+# Raw columns each logical table must provide, in display order
+TABLE_COLUMNS = {
+    'social': [
+        'Month',
+        'Spend (USD)',
+        'Impressions',
+        'Clicks to dolby.com landing',
+        'Attributed sweeps signups on dolby.com',
+    ],
+    'website': [
+        'Month',
+        'Website visits',
+        'Uniques',
+        'Average session duration (min)',
+        'Demos completed',
+        'Total sweeps signups',
+    ],
+    'events': [
+        'Month',
+        'Industry Event',
+        'Event spend for Dolby Play',
+        '# demos of Dolby Play conducted for mobile device partner contacts',
+        '# new mobile device partner leads generated',
+    ],
+    'monitoring': [
+        'Month',
+        'Platform',
+        'Followers',
+        'Engagement rate',
+        'Mentions',
+        'Sentiment Score',
+        'Share of Voice',
+    ],
+    'brandpulse': [
+        'Quarter',
+        'Metric',
+        'Age Group',
+        'Gender',
+        'Score',
+        'Comp. avg.',
+    ],
+}
+
+# Column used for time-range predicates ("2025-01" / "2025 Q1", both sort lexically)
+TIME_COLUMNS = {
+    'social': 'Month',
+    'website': 'Month',
+    'events': 'Month',
+    'monitoring': 'Month',
+    'brandpulse': 'Quarter',
+}
+
+TABLE_NAMES = tuple(TABLE_COLUMNS)
+
+# Low-cardinality labels stored as categoricals
+CATEGORICAL_COLUMNS = ['Platform', 'Metric', 'Age Group', 'Gender', 'Industry Event']
+
+
+def validate_table(table):
+    """Raise ValueError for an unknown logical table name"""
+    if table not in TABLE_COLUMNS:
+        raise ValueError(f"Unknown table '{table}', expected one of {', '.join(TABLE_NAMES)}")
+
+
+def validate_columns(table, available, source='source'):
+    """Raise ValueError if any expected column of table is missing from available"""
+    validate_table(table)
+    missing = [col for col in TABLE_COLUMNS[table] if col not in set(available)]
+    if missing:
+        raise ValueError(f"{source}: table '{table}' is missing columns {missing}")
+
+
+def resolve_columns(table, columns=None):
+    """Validate a column projection for table (None selects every column)"""
+    validate_table(table)
+    if columns is None:
+        return list(TABLE_COLUMNS[table])
+    unknown = [col for col in columns if col not in TABLE_COLUMNS[table]]
+    if unknown:
+        raise ValueError(f"Table '{table}' has no columns {unknown}")
+    return list(columns)
+
+
+def memory_footprint(df):
+    """Bytes held by df, including string contents"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def _downcast(values):
+    """Smallest numeric dtype that holds values exactly (ints always, floats only if lossless)"""
+    if pd.api.types.is_bool_dtype(values):
+        return values
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_numeric(values, downcast='integer')
+    if pd.api.types.is_float_dtype(values) and values.dtype != np.float32:
+        as_float32 = values.astype(np.float32)
+        if np.array_equal(as_float32.to_numpy(dtype='float64'), values.to_numpy(), equal_nan=True):
+            return as_float32
+    return values
+
+
+def compact_table(table, df):
+    """Return df with compact dtypes and a {'before', 'after'} bytes report
+
+    Month becomes datetime64 (first day of the month, or the day for daily
+    exports), Quarter an ordered categorical, label columns categoricals,
+    and numeric columns are downcast where no value changes.
+    """
+    validate_table(table)
+    before = memory_footprint(df)
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if col == 'Month':
+            values = pd.to_datetime(values)
+        elif col == 'Quarter':
+            values = pd.Categorical(values, categories=sorted(pd.unique(values.dropna())), ordered=True)
+        elif col in CATEGORICAL_COLUMNS:
+            values = values.astype('category')
+        elif pd.api.types.is_numeric_dtype(values):
+            values = _downcast(values)
+        columns[col] = values
+    compact = pd.DataFrame(columns, index=df.index)
+    # Tag the frame with its table; slices and views keep the tag, which lets
+    # caches built on top of it invalidate per table
+    compact.attrs['table'] = table
+    return compact, {'before': before, 'after': memory_footprint(compact)}
+
+
+def append_frames(existing, new):
+    """Concatenate two compacted frames of the same table, keeping categoricals
+
+    Categories seen only in new are added after the existing ones (Quarter
+    categories stay sorted).
+    """
+    columns = {}
+    for col in existing.columns:
+        old_values, new_values = existing[col], new[col]
+        if isinstance(old_values.dtype, pd.CategoricalDtype):
+            categories = old_values.cat.categories
+            unseen = pd.Index(new_values.astype(object).dropna().unique()).difference(categories, sort=False)
+            categories = categories.append(unseen)
+            if old_values.cat.ordered:
+                categories = pd.Index(sorted(categories))
+            dtype = pd.CategoricalDtype(categories, ordered=old_values.cat.ordered)
+            old_values, new_values = old_values.astype(dtype), new_values.astype(object).astype(dtype)
+        columns[col] = pd.concat([old_values, new_values], ignore_index=True)
+    combined = pd.DataFrame(columns)
+    combined.attrs = dict(existing.attrs)
+    return combined
@@ -0,0 +1,283 @@
+"""Pluggable data sources for the five logical dashboard tables
+
+Every source implements read_table(table, columns, start, end): columns is an
+optional projection and start/end an optional inclusive range on the table's
+time column (Month or Quarter), so pages only read what they plot.
+iter_table() reads the same rows in bounded chunks for streaming.
+"""
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from dashboard.processing import PARSED_COLUMNS
+from dashboard.sample_data import load_sample_data
+from dashboard.schema import TABLE_NAMES, TIME_COLUMNS, resolve_columns, validate_columns, validate_table
+from dashboard.streaming import DEFAULT_STREAM_ROWS, stream_keys, stream_rollup
+
+# File extensions recognised by FileDataSource, in lookup order
+FILE_FORMATS = {
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.csv': 'csv',
+}
+
+
+def _read_columns(table, columns, start, end):
+    """Columns to physically read: the projection plus the time column if filtering"""
+    columns = resolve_columns(table, columns)
+    time_column = TIME_COLUMNS[table]
+    if (start is not None or end is not None) and time_column not in columns:
+        return columns, columns + [time_column]
+    return columns, columns
+
+
+def _time_mask(values, start, end):
+    """Boolean mask of values within the inclusive [start, end] range"""
+    mask = pd.Series(True, index=values.index)
+    if start is not None:
+        mask &= values >= start
+    if end is not None:
+        mask &= values <= end
+    return mask
+
+
+class DataSource:
+    """Base class for table sources"""
+
+    def read_table(self, table, columns=None, start=None, end=None):
+        """Read one logical table as a DataFrame"""
+        raise NotImplementedError
+
+    def iter_table(self, table, columns=None, start=None, end=None, chunk_rows=DEFAULT_STREAM_ROWS):
+        """Read one logical table as DataFrames of at most chunk_rows rows
+
+        The default reads the whole table; file sources override it to keep
+        only one chunk in memory at a time.
+        """
+        df = self.read_table(table, columns, start=start, end=end)
+        for offset in range(0, len(df), chunk_rows):
+            yield df.iloc[offset:offset + chunk_rows].copy()
+
+    def cache_key(self):
+        """Identity of the data currently behind this source, for cache keys"""
+        raise NotImplementedError
+
+    def identity(self):
+        """Identity of the source itself, stable while its data changes"""
+        return type(self).__name__
+
+    def parse_report(self, table):
+        """Coerced cell counts of the formatted columns of table parsed while reading it
+
+        Empty for sources that return formatted columns unparsed, which the
+        registry parses and counts itself.
+        """
+        return {}
+
+    def read_tables(self, tables=None, columns=None, start=None, end=None):
+        """Read several tables; columns optionally maps table -> projection"""
+        columns = columns or {}
+        return {
+            table: self.read_table(table, columns.get(table), start=start, end=end)
+            for table in (tables or TABLE_NAMES)
+        }
+
+
+class SampleDataSource(DataSource):
+    """The built-in six-month sample data"""
+
+    def __init__(self):
+        self._tables = None
+
+    def cache_key(self):
+        return 'sample'
+
+    def read_table(self, table, columns=None, start=None, end=None):
+        validate_table(table)
+        if self._tables is None:
+            self._tables = load_sample_data()
+        df = self._tables[table]
+        columns, _ = _read_columns(table, columns, start, end)
+        if start is not None or end is not None:
+            df = df[_time_mask(df[TIME_COLUMNS[table]], start, end)].reset_index(drop=True)
+        return df[columns].copy()
+
+
+class FileDataSource(DataSource):
+    """Tables stored as <directory>/<table>.parquet|.arrow|.feather|.csv
+
+    Parquet and Arrow IPC files are memory-mapped and read with column
+    projection and predicate pushdown on the time column. CSV has no
+    pushdown: only the projected columns are parsed, then rows are filtered.
+    Time columns must be stored as strings ("2025-01", "2025 Q1"; daily
+    exports "2025-01-15"). iter_table streams parquet by record batch, Arrow
+    by memory-mapped record batch and CSV by chunked parsing.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.fspath(directory)
+
+    def path_for(self, table):
+        """Path and format of the file backing table"""
+        validate_table(table)
+        for extension, fmt in FILE_FORMATS.items():
+            path = os.path.join(self.directory, table + extension)
+            if os.path.exists(path):
+                return path, fmt
+        raise FileNotFoundError(f"No data file for table '{table}' in {self.directory}")
+
+    def identity(self):
+        return f"{type(self).__name__}:{self.directory}"
+
+    def cache_key(self):
+        parts = [self.directory]
+        for table in TABLE_NAMES:
+            try:
+                path, _ = self.path_for(table)
+            except FileNotFoundError:
+                continue
+            stat = os.stat(path)
+            parts.append(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+        return '|'.join(parts)
+
+    def available_columns(self, table):
+        """Column names present in the file backing table"""
+        path, fmt = self.path_for(table)
+        if fmt == 'parquet':
+            return pq.read_schema(path, memory_map=True).names
+        if fmt == 'arrow':
+            with pa.memory_map(path, 'r') as source:
+                return pa.ipc.open_file(source).schema.names
+        return list(pd.read_csv(path, nrows=0).columns)
+
+    def read_table(self, table, columns=None, start=None, end=None):
+        path, fmt = self.path_for(table)
+        validate_columns(table, self.available_columns(table), source=path)
+        columns, read_columns = _read_columns(table, columns, start, end)
+        time_column = TIME_COLUMNS[table]
+
+        if fmt == 'parquet':
+            filters = []
+            if start is not None:
+                filters.append((time_column, '>=', start))
+            if end is not None:
+                filters.append((time_column, '<=', end))
+            arrow_table = pq.read_table(path, columns=columns, filters=filters or None, memory_map=True)
+            return arrow_table.to_pandas()
+
+        if fmt == 'arrow':
+            with pa.memory_map(path, 'r') as source:
+                arrow_table = pa.ipc.open_file(source).read_all().select(read_columns)
+                if start is not None:
+                    arrow_table = arrow_table.filter(pc.greater_equal(arrow_table[time_column], start))
+                if end is not None:
+                    arrow_table = arrow_table.filter(pc.less_equal(arrow_table[time_column], end))
+                return arrow_table.select(columns).to_pandas()
+
+        df = pd.read_csv(path, usecols=read_columns, dtype={time_column: str})
+        if start is not None or end is not None:
+            df = df[_time_mask(df[time_column], start, end)].reset_index(drop=True)
+        return df[columns]
+
+    def iter_table(self, table, columns=None, start=None, end=None, chunk_rows=DEFAULT_STREAM_ROWS):
+        path, fmt = self.path_for(table)
+        validate_columns(table, self.available_columns(table), source=path)
+        columns, read_columns = _read_columns(table, columns, start, end)
+        time_column = TIME_COLUMNS[table]
+
+        if fmt == 'parquet':
+            batches = pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunk_rows, columns=read_columns)
+            chunks = (batch.to_pandas() for batch in batches)
+        elif fmt == 'arrow':
+            chunks = self._iter_arrow(path, read_columns, chunk_rows)
+        else:
+            chunks = pd.read_csv(path, usecols=read_columns, dtype={time_column: str}, chunksize=chunk_rows)
+
+        for df in chunks:
+            if start is not None or end is not None:
+                df = df[_time_mask(df[time_column], start, end)].reset_index(drop=True)
+            if len(df):
+                yield df[columns]
+
+    def _iter_arrow(self, path, columns, chunk_rows):
+        """Memory-mapped record batches of an Arrow IPC file as DataFrames of at most chunk_rows rows"""
+        with pa.memory_map(path, 'r') as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i).select(columns)
+                for offset in range(0, batch.num_rows, chunk_rows):
+                    yield batch.slice(offset, chunk_rows).to_pandas()
+
+
+class StreamingDataSource(DataSource):
+    """Another source's tables rolled up per period while streaming them in chunks
+
+    read_table returns one row per period (and per label, e.g. Platform)
+    with the raw column names, so the rest of the dashboard processes it
+    like any other source: summed and averaged columns hold the aggregated
+    numbers (formatted columns as plain numbers), Month the period start.
+    The full export is never held in memory (see dashboard.streaming).
+    """
+
+    def __init__(self, source, granularity='monthly', chunk_rows=DEFAULT_STREAM_ROWS):
+        self.source = source
+        self.granularity = granularity
+        self.chunk_rows = chunk_rows
+        self._parse_reports = {}    # table -> {column: coerced cells} of the latest reads
+
+    def identity(self):
+        return f"{type(self).__name__}:{self.granularity}:{self.source.identity()}"
+
+    def cache_key(self):
+        return f"{self.granularity}:{self.source.cache_key()}"
+
+    def parse_report(self, table):
+        return dict(self._parse_reports.get(table, {}))
+
+    def read_table(self, table, columns=None, start=None, end=None):
+        columns = resolve_columns(table, columns)
+        parsed = {source: target for target, (source, _) in PARSED_COLUMNS[table].items()}
+        keys = stream_keys(table)
+        values = [parsed.get(col, col) for col in columns if col not in keys]
+        report = {}
+        df = stream_rollup(self.source, table, values, self.granularity, start=start, end=end,
+                           chunk_rows=self.chunk_rows, parse_report=report)
+        self._parse_reports.setdefault(table, {}).update(report)
+        df = df.rename(columns={target: source for source, target in parsed.items()})
+        if 'Month' in df.columns:
+            df['Month'] = pd.to_datetime(df['Month']).dt.strftime('%Y-%m' if self.granularity == 'monthly' else '%Y-%m-%d')
+        return df[columns]
+
+
+def get_data_source(directory=None, stream=None):
+    """FileDataSource for directory (or $DOLBY_DASHBOARD_DATA_DIR), else the sample data
+
+    stream (or $DOLBY_DASHBOARD_STREAM) names a granularity ('daily',
+    'weekly', 'monthly') to stream the tables rolled up to, for exports
+    larger than memory.
+    """
+    directory = directory or os.environ.get('DOLBY_DASHBOARD_DATA_DIR')
+    source = FileDataSource(directory) if directory else SampleDataSource()
+    stream = stream or os.environ.get('DOLBY_DASHBOARD_STREAM')
+    if stream:
+        return StreamingDataSource(source, stream)
+    return source
+
+
+def write_tables(tables, directory, fmt='parquet'):
+    """Write {table: DataFrame} to directory in a format FileDataSource reads"""
+    os.makedirs(directory, exist_ok=True)
+    extension = {'parquet': '.parquet', 'arrow': '.arrow', 'csv': '.csv'}[fmt]
+    for table, df in tables.items():
+        validate_columns(table, df.columns, source='write_tables')
+        path = os.path.join(directory, table + extension)
+        if fmt == 'parquet':
+            df.to_parquet(path, index=False)
+        elif fmt == 'arrow':
+            df.reset_index(drop=True).to_feather(path)
+        else:
+            df.to_csv(path, index=False)
@@ -0,0 +1,207 @@
+"""Process-wide store of processed tables shared by every session
+
+The store keeps one DatasetRegistry per data source. When the source's
+cache key changes, a background thread reads, processes and warms a new
+registry while the current one keeps being served (stale while
+revalidate), then swaps it in atomically, so superseded versions are
+released instead of accumulating and no rerun waits for a reload. Rows
+appended to the served version (DatasetRegistry.append) are replayed into
+the new one unless the reloaded source already covers their periods (the
+appended month was since written to the files), so a refresh neither drops
+nor double counts them. Only the
+very first load of a source happens in the caller. watch() also checks on
+a timer, so a new version is usually ready before anyone reruns.
+Registries hand out zero-copy, write-isolated views of their frames (see
+registry.session_view).
+"""
+import logging
+import threading
+import time
+
+import pandas as pd
+
+from dashboard.instrumentation import RunProfile, profiling, record_error, write_log
+from dashboard.registry import SECTION_CUBES, DatasetRegistry
+from dashboard.schema import TIME_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Loads retried by one refresh when the source changes again while it is read
+REFRESH_ATTEMPTS = 3
+
+
+def warm(registry):
+    """Materialize every section, cube, the KPIs, the fact table and the time periods of a registry"""
+    registry.prefetch()
+    for section in SECTION_CUBES:
+        registry.cube(section)
+    registry.kpis()
+    registry.facts()
+    registry.periods()
+
+
+def _last_period(registry, table):
+    """Latest value of table's time column in registry (None when empty)"""
+    time_column = TIME_COLUMNS[table]
+    loaded = registry.table(table, [time_column])[time_column]
+    return None if loaded.empty else loaded.max()
+
+
+def _uncovered_rows(table, batch, last_period):
+    """Rows of an appended batch later than last_period"""
+    time_column = TIME_COLUMNS[table]
+    if last_period is None:
+        return batch
+    if time_column == 'Month':
+        return batch[pd.to_datetime(batch[time_column]) > last_period]
+    return batch[batch[time_column].astype(str) > str(last_period)]
+
+
+def _replay_appends(previous, registry, replayed):
+    """Append the rows appended to previous (a served version, or None) that registry lacks
+
+    Rows of periods the reloaded source already holds are dropped rather
+    than counted twice. replayed maps table -> (batches already replayed,
+    last period read from the source); returns it updated.
+    """
+    if previous is not None:
+        for table, batches in previous[1].appended().items():
+            done, last_period = replayed.get(table) or (0, _last_period(registry, table))
+            for batch in batches[done:]:
+                rows = _uncovered_rows(table, batch, last_period)
+                if len(rows):
+                    registry.append(table, rows)
+            replayed[table] = (len(batches), last_period)
+    return replayed
+
+
+class SharedDatasetStore:
+    """Thread-safe map of data source -> registry for its latest loaded version"""
+
+    def __init__(self, executor=None):
+        self.executor = executor    # worker pool shared by every registry (see DatasetRegistry)
+        self._lock = threading.Lock()
+        self._registries = {}   # source identity -> (cache key, registry, loaded at)
+        self._refreshing = {}   # source identity -> background refresh thread
+        self._failed = {}       # source identity -> (cache key, error message) of the last failed refresh
+        self._watchers = {}     # source identity -> (watch thread, stop event)
+
+    def registry(self, source):
+        """Registry serving the source's data; never waits for a background refresh
+
+        A source seen for the first time is loaded lazily by the caller. Once
+        its data changes the previous version keeps being served while the
+        new one loads in the background (a version that failed to load is
+        not retried until the source changes again or refresh() is called).
+        """
+        identity, cache_key = source.identity(), source.cache_key()
+        with self._lock:
+            current = self._registries.get(identity)
+            if current is None:
+                current = (cache_key, DatasetRegistry(source, executor=self.executor), time.time())
+                self._registries[identity] = current
+            elif current[0] != cache_key and self._failed.get(identity, (None,))[0] != cache_key:
+                self._start_refresh(source)
+            return current[1]
+
+    def refresh(self, source):
+        """Reload source in the background and swap it in when ready; False if a refresh is already running"""
+        with self._lock:
+            return self._start_refresh(source)
+
+    def _start_refresh(self, source):
+        """Start the refresh thread of source unless one is running (caller holds the lock)"""
+        identity = source.identity()
+        if identity in self._refreshing:
+            return False
+        thread = threading.Thread(target=self._refresh, args=(source,), name=f"refresh:{identity}", daemon=True)
+        self._refreshing[identity] = thread
+        thread.start()
+        return True
+
+    def _refresh(self, source):
+        """Load, process and warm a new registry for source, then swap it in"""
+        identity = source.identity()
+        cache_key = None
+        with self._lock:
+            previous = self._registries.get(identity)
+        try:
+            with profiling(RunProfile('refresh', source=identity)) as profile:
+                try:
+                    for _ in range(REFRESH_ATTEMPTS):
+                        cache_key, loaded_at = source.cache_key(), time.time()
+                        registry = DatasetRegistry(source, executor=self.executor)
+                        replayed = _replay_appends(previous, registry, {})
+                        warm(registry)
+                        # Files replaced while they were read: load again rather
+                        # than serve a version mixing old and new tables
+                        if source.cache_key() == cache_key:
+                            break
+                except Exception as e:
+                    record_error(e)
+                    logger.exception("Background refresh of %s failed", identity)
+                    with self._lock:
+                        self._failed[identity] = (cache_key, f"{type(e).__name__}: {e}")
+                    return
+                with self._lock:
+                    # Batches appended while the new version was loading
+                    _replay_appends(previous, registry, replayed)
+                    self._registries[identity] = (cache_key, registry, loaded_at)
+                    self._failed.pop(identity, None)
+        finally:
+            write_log(profile)
+            with self._lock:
+                del self._refreshing[identity]
+
+    def status(self, source):
+        """{'loaded_at', 'refreshing', 'error'} of the version of source being served"""
+        identity = source.identity()
+        with self._lock:
+            current = self._registries.get(identity)
+            failed = self._failed.get(identity)
+            return {
+                'loaded_at': current[2] if current is not None else None,
+                'refreshing': identity in self._refreshing,
+                'error': failed[1] if failed is not None else None,
+            }
+
+    def watch(self, source, interval, max_age=None):
+        """Check source every interval seconds and refresh it in the background when it changed
+
+        With max_age, a version older than max_age seconds is reloaded even
+        if the cache key is unchanged (for sources whose changes it cannot
+        see). Watching an already watched source does nothing.
+        """
+        identity = source.identity()
+        with self._lock:
+            if identity in self._watchers:
+                return
+            stop = threading.Event()
+            thread = threading.Thread(target=self._watch, args=(source, interval, max_age, stop),
+                                      name=f"watch:{identity}", daemon=True)
+            self._watchers[identity] = (thread, stop)
+        thread.start()
+
+    def _watch(self, source, interval, max_age, stop):
+        """Body of a watch thread"""
+        while not stop.wait(interval):
+            try:
+                self.registry(source)
+                loaded_at = self.status(source)['loaded_at']
+                if max_age is not None and loaded_at is not None and time.time() - loaded_at > max_age:
+                    self.refresh(source)
+            except Exception:
+                logger.exception("Checking %s for changes failed", source.identity())
+
+    def unwatch(self):
+        """Stop every watch thread"""
+        with self._lock:
+            watchers, self._watchers = self._watchers, {}
+        for _, stop in watchers.values():
+            stop.set()
+
+    def clear(self):
+        """Drop every registry; the next access reloads from the sources"""
+        with self._lock:
+            self._registries.clear()
+            self._failed.clear()
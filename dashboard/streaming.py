@@ -0,0 +1,125 @@
+"""Streaming rollups for exports larger than memory
+
+A table is read chunk by chunk (DataSource.iter_table), each chunk's
+formatted columns are parsed, and the chunk is reduced to per-group partial
+sums, non-null counts and last values. Partials are merged as they
+accumulate, so memory is bounded by the chunk size and the number of
+(period, group) rows, never by the size of the export. Ratio metrics are
+computed once at the end from the summed numerators and denominators, which
+is what rollup() gives for the whole table in memory.
+"""
+import pandas as pd
+
+from dashboard.metrics import compute_metrics, table_metrics
+from dashboard.processing import resolve_dependencies, process_table
+from dashboard.resampling import AGGREGATIONS, GRANULARITIES, period_starts
+from dashboard.schema import TIME_COLUMNS, validate_table
+
+# Rows read per chunk when streaming
+DEFAULT_STREAM_ROWS = 100_000
+
+# Label columns each table is rolled up by, besides its time column
+GROUP_COLUMNS = {
+    'social': [],
+    'website': [],
+    'events': ['Industry Event'],
+    'monitoring': ['Platform'],
+    'brandpulse': ['Metric', 'Age Group', 'Gender'],
+}
+
+# Partial aggregate kept per column for each way of combining it
+PARTIALS = {
+    'sum': ['sum'],
+    'mean': ['sum', 'count'],
+    'last': ['last'],
+}
+
+
+def stream_keys(table):
+    """Group-by keys of a table's streamed rollup: its time column, then its labels"""
+    validate_table(table)
+    return [TIME_COLUMNS[table]] + GROUP_COLUMNS[table]
+
+
+def stream_columns(table):
+    """Every column a streamed rollup of table can hold (aggregated columns, then ratios)"""
+    raw_columns, derived = resolve_dependencies(table)
+    available = set(raw_columns) | derived
+    keys = stream_keys(table)
+    return ([col for col in AGGREGATIONS if col in available and col not in keys]
+            + [m.name for m in table_metrics(table)])
+
+
+def _partial(df, keys, aggregations):
+    """Per-group partial aggregates of one chunk, groups in order of first appearance"""
+    spec = {f'{col}|{part}': (col, part) for col, how in aggregations.items() for part in PARTIALS[how]}
+    grouped = df.groupby(keys, sort=False, observed=True)
+    if not spec:
+        # Key-only read (e.g. the time column alone): keep the distinct keys
+        return grouped.size().to_frame('|rows')
+    return grouped.agg(**spec)
+
+
+def _merge(partials):
+    """Combine partial aggregates of consecutive chunks into one"""
+    combined = pd.concat(partials)
+    how = {col: 'last' if col.endswith('|last') else 'sum' for col in combined.columns}
+    return combined.groupby(level=list(range(combined.index.nlevels)), sort=False).agg(how)
+
+
+def stream_rollup(source, table, columns=None, granularity='monthly', start=None, end=None,
+                  chunk_rows=DEFAULT_STREAM_ROWS, parse_report=None):
+    """Roll table up to one row per period and group while reading it in chunks
+
+    columns lists the aggregated and ratio columns wanted (None for all of
+    stream_columns(table)); the result holds stream_keys(table) followed by
+    those columns. Month is mapped to the start of its period at the given
+    granularity; Quarter is kept as is. Groups appear in order of first
+    appearance. If parse_report is given it is filled with the coerced cell
+    counts of the formatted columns, summed over every chunk.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity '{granularity}', expected one of {', '.join(GRANULARITIES)}")
+    keys = stream_keys(table)
+    columns = stream_columns(table) if columns is None else list(columns)
+    metrics = [m for m in table_metrics(table) if m.name in columns]
+    unknown = [col for col in columns if col not in AGGREGATIONS and col not in {m.name for m in metrics}]
+    if unknown:
+        raise ValueError(f"Table '{table}' cannot stream-aggregate columns {unknown}")
+    value_columns = list(dict.fromkeys(
+        [col for col in columns if col in AGGREGATIONS]
+        + [col for m in metrics for col in (m.numerator, m.denominator)]
+    ))
+    raw_columns, derived = resolve_dependencies(table, keys + value_columns)
+    aggregations = {col: AGGREGATIONS[col] for col in value_columns}
+    report = {} if parse_report is None else parse_report
+
+    partials, pending_rows = [], 0
+    parsed = derived - {m.name for m in table_metrics(table)}
+    for chunk in source.iter_table(table, raw_columns, start=start, end=end, chunk_rows=chunk_rows):
+        for column, count in process_table(table, chunk, parsed).items():
+            report[column] = report.get(column, 0) + count
+        if TIME_COLUMNS[table] == 'Month':
+            chunk['Month'] = period_starts(pd.to_datetime(chunk['Month']), granularity)
+        partials.append(_partial(chunk, keys, aggregations))
+        pending_rows += len(partials[-1])
+        # Merge once the partials outgrow a chunk, so they stay bounded by
+        # the number of groups rather than the number of chunks
+        if pending_rows > chunk_rows:
+            partials = [_merge(partials)]
+            pending_rows = len(partials[0])
+
+    if not partials:
+        return pd.DataFrame(columns=keys + columns)
+    merged = _merge(partials)
+    out = pd.DataFrame(index=merged.index)
+    for col, how in aggregations.items():
+        if how == 'mean':
+            counts = merged[f'{col}|count']
+            out[col] = (merged[f'{col}|sum'] / counts).where(counts > 0)
+        else:
+            out[col] = merged[f'{col}|{PARTIALS[how][0]}']
+    out = out.reset_index()
+    compute_metrics(out, table, [m.name for m in metrics])
+    return out[keys + columns]
+
@@ -0,0 +1,159 @@
+"""Seeded synthetic tables with the exact schemas of the sample data, at any scale
+
+Generated tables have the same column names, string formats ("$125,441",
+"3.60%", "2025-01", "2025 Q1") and label values (platforms, events,
+demographics) as load_sample_data(), with magnitudes around the sample's.
+The same (table, rows, seed) always gives the same frame. write_synthetic()
+writes tables chunk by chunk, so files larger than memory can be produced.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dashboard.schema import TABLE_COLUMNS, TABLE_NAMES, validate_table
+
+PLATFORMS = ['Instagram', 'LinkedIn', 'TikTok']
+INDUSTRY_EVENTS = ['CES', 'Mobile World Congress', 'SXSW', 'Game Asia', 'IFA', 'Computex', 'GDC', 'Gamescom']
+BRAND_METRICS = ['Aided Awareness', 'Purchase Consideration', 'Unaided Awareness']
+AGE_GROUPS = ['18-34', '35-54']
+GENDERS = ['Female', 'Male']
+
+# Placeholder written into formatted columns for the invalid_fraction of cells
+INVALID_VALUE = 'n/a'
+
+# Rows generated per chunk by write_synthetic
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def _currency(values):
+    """Integers formatted like "$125,441" """
+    return [f'${value:,}' for value in values.tolist()]
+
+
+def _percentage(values, decimals):
+    """Floats formatted like "3.60%" """
+    return np.char.mod(f'%.{decimals}f%%', values).tolist()
+
+
+def _invalidate(values, rng, fraction):
+    """Replace a random fraction of formatted cells with INVALID_VALUE"""
+    if fraction:
+        for i in np.flatnonzero(rng.random(len(values)) < fraction):
+            values[i] = INVALID_VALUE
+    return values
+
+
+def _months(rows, periods, offset, total_rows, start):
+    """Month strings for rows offset..offset+rows of a time-ordered export spread over periods months"""
+    position = (np.arange(offset, offset + rows) * periods) // max(total_rows, 1)
+    months = pd.period_range(start, periods=periods, freq='M').strftime('%Y-%m')
+    return np.asarray(months)[position]
+
+
+def _quarters(rows, periods, offset, total_rows, start):
+    """Quarter strings ("2025 Q1") for a time-ordered export spread over periods quarters"""
+    position = (np.arange(offset, offset + rows) * periods) // max(total_rows, 1)
+    quarters = pd.period_range(start, periods=periods, freq='Q')
+    labels = np.asarray([f'{q.year} Q{q.quarter}' for q in quarters])
+    return labels[position]
+
+
+def generate_table(table, rows, seed=0, periods=None, start='2020-01', invalid_fraction=0.0,
+                   offset=0, total_rows=None):
+    """One synthetic table of rows rows, time-ordered over periods months (quarters for brandpulse)
+
+    periods defaults to min(rows, 120). offset and total_rows generate one
+    chunk of a larger table: the chunk covers rows offset..offset+rows of a
+    total_rows table and gets its own seed stream. invalid_fraction of the
+    formatted cells are replaced by INVALID_VALUE to exercise coercion.
+    """
+    validate_table(table)
+    total_rows = rows if total_rows is None else total_rows
+    periods = periods or max(min(total_rows, 120), 1)
+    rng = np.random.default_rng([seed, TABLE_NAMES.index(table), offset])
+
+    if table == 'social':
+        data = {
+            'Month': _months(rows, periods, offset, total_rows, start),
+            'Spend (USD)': _invalidate(_currency(rng.integers(115_000, 131_000, rows)), rng, invalid_fraction),
+            'Impressions': rng.integers(12_000_000, 13_500_000, rows),
+            'Clicks to dolby.com landing': rng.integers(85_000, 120_000, rows),
+            'Attributed sweeps signups on dolby.com': rng.integers(3_800, 5_800, rows),
+        }
+    elif table == 'website':
+        data = {
+            'Month': _months(rows, periods, offset, total_rows, start),
+            'Website visits': rng.integers(2_300_000, 3_900_000, rows),
+            'Uniques': rng.integers(1_600_000, 2_600_000, rows),
+            'Average session duration (min)': np.round(rng.uniform(2.3, 3.0, rows), 1),
+            'Demos completed': rng.integers(40_000, 65_000, rows),
+            'Total sweeps signups': rng.integers(10_000, 15_500, rows),
+        }
+    elif table == 'events':
+        data = {
+            'Month': _months(rows, periods, offset, total_rows, start),
+            'Industry Event': np.asarray(INDUSTRY_EVENTS)[rng.integers(0, len(INDUSTRY_EVENTS), rows)],
+            'Event spend for Dolby Play': _invalidate(_currency(rng.integers(5, 80, rows) * 10_000), rng, invalid_fraction),
+            '# demos of Dolby Play conducted for mobile device partner contacts': rng.integers(40, 90, rows),
+            '# new mobile device partner leads generated': rng.integers(0, 20, rows),
+        }
+    elif table == 'monitoring':
+        data = {
+            'Month': _months(rows, periods, offset, total_rows, start),
+            'Platform': np.asarray(PLATFORMS)[(np.arange(offset, offset + rows)) % len(PLATFORMS)],
+            'Followers': rng.integers(80_000, 460_000, rows),
+            'Engagement rate': _invalidate(_percentage(rng.uniform(1.5, 6.0, rows), 2), rng, invalid_fraction),
+            'Mentions': rng.integers(1_000, 7_000, rows),
+            'Sentiment Score': np.round(rng.uniform(0.6, 0.85, rows), 2),
+            'Share of Voice': _invalidate(_percentage(rng.uniform(5.0, 18.0, rows), 2), rng, invalid_fraction),
+        }
+    else:
+        groups = np.arange(offset, offset + rows)
+        data = {
+            'Quarter': _quarters(rows, periods, offset, total_rows, start),
+            'Metric': np.asarray(BRAND_METRICS)[groups // (len(AGE_GROUPS) * len(GENDERS)) % len(BRAND_METRICS)],
+            'Age Group': np.asarray(AGE_GROUPS)[groups // len(GENDERS) % len(AGE_GROUPS)],
+            'Gender': np.asarray(GENDERS)[groups % len(GENDERS)],
+            'Score': _invalidate(_percentage(rng.uniform(15.0, 75.0, rows), 1), rng, invalid_fraction),
+            'Comp. avg.': _invalidate(_percentage(rng.uniform(15.0, 70.0, rows), 1), rng, invalid_fraction),
+        }
+    df = pd.DataFrame(data, index=pd.RangeIndex(offset, offset + rows))
+    return df[TABLE_COLUMNS[table]].reset_index(drop=True)
+
+
+def generate_tables(rows, seed=0, tables=None, **kwargs):
+    """{table: synthetic frame} with rows rows each (rows may also map table -> rows)"""
+    tables = tables or TABLE_NAMES
+    counts = rows if isinstance(rows, dict) else {table: rows for table in tables}
+    return {table: generate_table(table, counts[table], seed=seed, **kwargs) for table in tables}
+
+
+def write_synthetic(directory, rows, fmt='parquet', seed=0, tables=None, chunk_rows=DEFAULT_CHUNK_ROWS, **kwargs):
+    """Write synthetic tables to directory in a format FileDataSource reads, one chunk at a time
+
+    Only one chunk of one table is in memory at once. Returns {table: path}.
+    """
+    os.makedirs(directory, exist_ok=True)
+    extension = {'parquet': '.parquet', 'arrow': '.arrow', 'csv': '.csv'}[fmt]
+    paths = {}
+    for table in tables or TABLE_NAMES:
+        path = os.path.join(directory, table + extension)
+        writer = None
+        for offset in range(0, rows, chunk_rows):
+            chunk = generate_table(table, min(chunk_rows, rows - offset), seed=seed,
+                                   offset=offset, total_rows=rows, **kwargs)
+            if fmt == 'csv':
+                chunk.to_csv(path, mode='w' if offset == 0 else 'a', header=offset == 0, index=False)
+                continue
+            batch = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = (pq.ParquetWriter(path, batch.schema) if fmt == 'parquet'
+                          else pa.ipc.new_file(path, batch.schema))
+            writer.write_table(batch)
+        if writer is not None:
+            writer.close()
+        paths[table] = path
+    return paths
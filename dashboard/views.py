@@ -0,0 +1,228 @@
+"""Declarative chart layout of every dashboard section
+
+A view is a list of rows, each a list of Charts drawn side by side. The
+Streamlit app renders views live and dashboard.export renders them to static
+files for every selector combination, so both always show the same charts.
+"""
+from dataclasses import dataclass, field
+
+from dashboard.figures import bar_chart, dual_axis_chart, funnel_chart, line_chart, trace_chart
+from dashboard.funnel import FUNNEL_STAGES
+
+# Section names -> sidebar labels, in sidebar order
+SECTION_LABELS = {
+    'overview': "🏠 Overview",
+    'social': "📱 Social Media Performance",
+    'website': "🌐 Website Engagement",
+    'events': "🎯 B2B Events",
+    'monitoring': "📊 Social Monitoring",
+    'brandpulse': "🎯 Brand Pulse Survey",
+    'funnel': "🔻 Funnel",
+}
+
+# Heading shown at the top of each section
+SECTION_HEADERS = {
+    'overview': "📈 Key Performance Indicators",
+    'social': "📱 B2C Social Media Performance",
+    'website': "🌐 B2C Website Engagement",
+    'events': "🎯 B2B Industry Events",
+    'monitoring': "📊 Social Media Monitoring",
+    'brandpulse': "🎯 Brand Pulse Survey Analysis",
+    'funnel': "🔻 Cross-Channel Funnel",
+}
+
+SOCIAL_METRIC_TYPES = ["Engagement Metrics", "Cost Metrics", "Volume Metrics"]
+
+# Overview KPI cards: (label, KPI name, format)
+KPI_CARDS = [
+    ("Total Social Spend", 'total_spend', "${:,.0f}"),
+    ("Total Signups", 'total_signups', "{:,}"),
+    ("Average CTR", 'average_ctr', "{:.2f}%"),
+    ("Total Website Visits", 'total_website_visits', "{:,}"),
+]
+
+
+@dataclass(eq=False)
+class Chart:
+    """builder(data, **params), e.g. Chart(line_chart, df, {'x': 'Month', ...})"""
+    builder: object
+    data: object
+    params: dict = field(default_factory=dict)
+
+
+def kpi_cards(kpis):
+    """(label, formatted value) of every overview KPI card"""
+    return [(label, fmt.format(kpis[name])) for label, name, fmt in KPI_CARDS]
+
+
+def overview_view(social_df, website_df):
+    """Spend and website traffic over time"""
+    return [[
+        Chart(line_chart, social_df, dict(x='Month', table='social', y='Spend_Clean',
+                                          title='Social Media Spend Over Time',
+                                          labels={'Spend_Clean': 'Spend ($)'}, line_width=3)),
+        Chart(line_chart, website_df, dict(x='Month', table='website', y='Website visits',
+                                           title='Website Visits Growth',
+                                           labels={'Website visits': 'Visits'}, line_width=3)),
+    ]]
+
+
+def social_view(social_df, metric_type):
+    """Engagement, cost or volume metrics of social media, per metric_type"""
+    if metric_type == "Engagement Metrics":
+        return [[
+            Chart(trace_chart, social_df, dict(x='Month', table='social',
+                                               traces=[{'y': 'CTR', 'name': 'CTR (%)', 'line': dict(width=3)}],
+                                               title='Click-Through Rate Over Time',
+                                               xaxis_title='Month', yaxis_title='CTR (%)')),
+            Chart(trace_chart, social_df, dict(x='Month', table='social',
+                                               traces=[{'y': 'Click_to_Signup_Rate', 'name': 'Signup Rate (%)',
+                                                        'line': dict(width=3, color='orange')}],
+                                               title='Click-to-Signup Rate Over Time',
+                                               xaxis_title='Month', yaxis_title='Signup Rate (%)')),
+        ]]
+    if metric_type == "Cost Metrics":
+        return [[
+            Chart(trace_chart, social_df, dict(x='Month', table='social',
+                                               traces=[{'y': 'CPM', 'name': 'CPM'},
+                                                       {'y': 'CPC', 'name': 'CPC'},
+                                                       {'y': 'CPSignup', 'name': 'Cost per Signup'}],
+                                               title='Cost Metrics Over Time',
+                                               xaxis_title='Month', yaxis_title='Cost ($)')),
+        ]]
+    # Volume Metrics
+    return [[
+        Chart(dual_axis_chart, social_df, dict(x='Month', table='social',
+                                               primary={'y': 'Impressions', 'name': 'Impressions (M)',
+                                                        'axis_title': 'Impressions (M)', 'divisor': 1000000},
+                                               secondary={'y': 'Clicks to dolby.com landing', 'name': 'Clicks (K)',
+                                                          'axis_title': 'Clicks (K)', 'divisor': 1000},
+                                               title='Volume Metrics Over Time')),
+    ]]
+
+
+def website_view(website_df):
+    """Traffic, session duration, demos and conversion rates"""
+    return [
+        [
+            Chart(trace_chart, website_df, dict(x='Month', table='website',
+                                                traces=[{'y': 'Website visits', 'name': 'Total Visits'},
+                                                        {'y': 'Uniques', 'name': 'Unique Visits'}],
+                                                title='Website Traffic Over Time',
+                                                xaxis_title='Month', yaxis_title='Visits')),
+            Chart(trace_chart, website_df, dict(x='Month', table='website',
+                                                traces=[{'y': 'Average session duration (min)',
+                                                         'name': 'Avg Session Duration',
+                                                         'line': dict(color='green', width=3)}],
+                                                title='Average Session Duration',
+                                                xaxis_title='Month', yaxis_title='Duration (min)')),
+        ],
+        [
+            Chart(trace_chart, website_df, dict(x='Month', table='website',
+                                                traces=[{'y': 'Demos completed', 'name': 'Demos Completed'},
+                                                        {'y': 'Total sweeps signups', 'name': 'Total Signups'}],
+                                                title='Demos vs Signups Over Time',
+                                                xaxis_title='Month', yaxis_title='Count')),
+            Chart(trace_chart, website_df, dict(x='Month', table='website',
+                                                traces=[{'y': 'Unique_to_Demo_Rate', 'name': 'Unique to Demo Rate'},
+                                                        {'y': 'Demo_to_Signup_Rate', 'name': 'Demo to Signup Rate'}],
+                                                title='Conversion Rates Over Time',
+                                                xaxis_title='Month', yaxis_title='Rate (%)')),
+        ],
+    ]
+
+
+def events_view(events_df):
+    """Spend, demos, leads and cost efficiency per industry event"""
+    return [
+        [
+            Chart(bar_chart, events_df, dict(x='Industry Event', y='Event_Spend_Clean',
+                                             title='Event Spend by Event',
+                                             labels={'Event_Spend_Clean': 'Spend ($)'})),
+            Chart(trace_chart, events_df, dict(x='Industry Event', kind='bar',
+                                               traces=[{'y': '# demos of Dolby Play conducted for mobile device partner contacts',
+                                                        'name': 'Demos', 'offsetgroup': 1},
+                                                       {'y': '# new mobile device partner leads generated',
+                                                        'name': 'Leads', 'offsetgroup': 2}],
+                                               title='Demos vs Leads by Event',
+                                               xaxis_title='Event', yaxis_title='Count')),
+        ],
+        [
+            Chart(trace_chart, events_df, dict(x='Industry Event', kind='bar',
+                                               traces=[{'y': 'CPDemo', 'name': 'Cost per Demo'},
+                                                       {'y': 'CPL', 'name': 'Cost per Lead'}],
+                                               title='Cost Efficiency by Event',
+                                               xaxis_title='Event', yaxis_title='Cost ($)')),
+            Chart(bar_chart, events_df, dict(x='Industry Event', y='Demo_to_Lead_Rate',
+                                             title='Demo to Lead Conversion Rate',
+                                             labels={'Demo_to_Lead_Rate': 'Conversion Rate (%)'})),
+        ],
+    ]
+
+
+def monitoring_view(monitoring_df):
+    """Followers, engagement, sentiment and share of voice per platform (monitoring_df already filtered)"""
+    return [
+        [
+            Chart(line_chart, monitoring_df, dict(x='Month', table='monitoring', y='Followers',
+                                                  color='Platform', title='Followers Growth by Platform')),
+            Chart(line_chart, monitoring_df, dict(x='Month', table='monitoring', y='Engagement_Rate_Clean',
+                                                  color='Platform', title='Engagement Rate by Platform',
+                                                  labels={'Engagement_Rate_Clean': 'Engagement Rate (%)'})),
+        ],
+        [
+            Chart(line_chart, monitoring_df, dict(x='Month', table='monitoring', y='Sentiment Score',
+                                                  color='Platform', title='Sentiment Score by Platform')),
+            Chart(line_chart, monitoring_df, dict(x='Month', table='monitoring', y='Share_of_Voice_Clean',
+                                                  color='Platform', title='Share of Voice by Platform',
+                                                  labels={'Share_of_Voice_Clean': 'Share of Voice (%)'})),
+        ],
+    ]
+
+
+def brandpulse_view(metric_data, selected_metric):
+    """Dolby and competitor scores and their gap for one metric (metric_data already selected)"""
+    return [
+        [
+            Chart(line_chart, metric_data, dict(x='Quarter', y='Score_Clean',
+                                                color='Demographic', title=f'{selected_metric} - Dolby Scores',
+                                                labels={'Score_Clean': 'Score (%)'})),
+            Chart(line_chart, metric_data, dict(x='Quarter', y='Comp_Avg_Clean',
+                                                color='Demographic', title=f'{selected_metric} - Competitor Average',
+                                                labels={'Comp_Avg_Clean': 'Score (%)'})),
+        ],
+        # Gap analysis
+        [
+            Chart(bar_chart, metric_data, dict(x='Quarter', y='Gap', color='Demographic',
+                                               title=f'{selected_metric} - Dolby vs Competitor Gap',
+                                               labels={'Gap': 'Gap (% points)'})),
+        ],
+    ]
+
+
+def funnel_view(facts_df):
+    """Impressions to signups funnel and blended social + events ratios (facts_df from registry.facts)"""
+    return [
+        [
+            Chart(funnel_chart, facts_df, dict(stages=FUNNEL_STAGES, title='Impressions → Signups Funnel')),
+            Chart(trace_chart, facts_df, dict(x='Month', table='funnel',
+                                              traces=[{'y': 'Impression_to_Click_Rate', 'name': 'Impression → Click'},
+                                                      {'y': 'Visit_to_Demo_Rate', 'name': 'Visit → Demo'},
+                                                      {'y': 'Demo_to_Signup_Rate', 'name': 'Demo → Signup'}],
+                                              title='Stage Conversion Rates Over Time',
+                                              xaxis_title='Month', yaxis_title='Rate (%)')),
+        ],
+        [
+            Chart(trace_chart, facts_df, dict(x='Month', table='funnel',
+                                              traces=[{'y': 'Blended_CPDemo', 'name': 'Blended Cost per Demo'},
+                                                      {'y': 'Blended_CPSignup', 'name': 'Blended Cost per Signup'}],
+                                              title='Blended Cost Efficiency (Social + Events)',
+                                              xaxis_title='Month', yaxis_title='Cost ($)')),
+            Chart(trace_chart, facts_df, dict(x='Month', table='funnel',
+                                              traces=[{'y': 'Social_Click_Share_of_Visits',
+                                                       'name': 'Social Clicks / Website Visits',
+                                                       'line': dict(width=3)}],
+                                              title='Social Clicks as a Share of Website Visits',
+                                              xaxis_title='Month', yaxis_title='Share (%)')),
+        ],
+    ]
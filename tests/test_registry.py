@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from dashboard.registry import SECTION_REQUIREMENTS, DatasetRegistry
+from dashboard.schema import TABLE_NAMES
+from dashboard.sources import FileDataSource, write_tables
+from dashboard.synthetic import generate_tables
+
+
+def test_append_matches_full_recompute(tmp_path):
+    """Appending the newest rows batch by batch gives the same tables, KPIs and facts as processing everything"""
+    tables = generate_tables(60, seed=3, periods=30, invalid_fraction=0.05)
+    write_tables(tables, tmp_path / 'full')
+    write_tables({table: df.iloc[:40] for table, df in tables.items()}, tmp_path / 'history')
+
+    appended = DatasetRegistry(FileDataSource(str(tmp_path / 'history')))
+    for section in SECTION_REQUIREMENTS:
+        appended.section(section)
+    appended.kpis()
+    appended.facts()
+    for table in TABLE_NAMES:
+        for start in (40, 50):
+            appended.append(table, tables[table].iloc[start:start + 10])
+
+    full = DatasetRegistry(FileDataSource(str(tmp_path / 'full')))
+    for section in SECTION_REQUIREMENTS:
+        for table, df in full.section(section).items():
+            pd.testing.assert_frame_equal(appended.section(section)[table], df, check_categorical=False)
+    assert appended.kpis() == pytest.approx(full.kpis())
+    pd.testing.assert_frame_equal(appended.facts(), full.facts())
+    assert appended.parse_report() == full.parse_report()